@@ -0,0 +1,114 @@
+import numpy as np
+
+LIBRATION = 0  # Колебания около нижнего положения равновесия
+ROTATION = 1  # Вращение через верхнее положение
+UNDEFINED = -1  # За время расчёта не видно ни того, ни другого (траектории около сепаратрисы)
+
+
+class Pendulum:
+    E = None  # calculate_energy
+    result_t = None  # add_results
+    result_alfa = None  # add_results
+    result_alfa_dot = None  # add_results
+    t0 = None  # add_initial_data
+    y0 = None  # add_initial_data
+
+    def __init__(self, g, l, m):
+        """
+        Инициализирует объект класса Pendulum.
+
+        :param g: Ускорение свободного падения (м/с^2).
+        :param l: Длина маятника (метры).
+        :param m: Масса маятника (килограммы).
+        """
+        self.g = g
+        self.l = l
+        self.m = m
+
+    def add_initial_data(self, t0: float, y0: np.ndarray):
+        """
+        Добавляет начальные данные для математического маятника.
+
+        :param t0: Время начальных данных (секунды).
+        :param y0: Начальные значения угла и угловой скорости в виде NumPy массива.
+        """
+        self.y0 = y0
+        self.t0 = t0
+
+    def add_results(self, result_t: np.ndarray, result_alfa: np.ndarray, result_alfa_dot: np.ndarray):
+        """
+        Добавляет результаты расчетов.
+
+        :param result_t: Временной массив результатов (секунды).
+        :param result_alfa: Угловые значения результатов в радианах в виде NumPy массива.
+        :param result_alfa_dot: Угловые скорости в радианах/секунду в виде NumPy массива.
+        """
+        self.result_t = result_t
+        self.result_alfa = result_alfa
+        self.result_alfa_dot = result_alfa_dot
+
+    def calculate_energy(self):
+        """
+        Рассчитывает полную энергию математического маятника.
+        """
+        self.E = 0.5 * self.m * self.l ** 2 * self.result_alfa_dot ** 2 + \
+            self.m * self.g * self.l * (1 - np.cos(self.result_alfa))
+        print(self.E[0])
+
+        self.E = self.E - self.E[0]
+
+
+def vector_function_right_parts(t: float, y: np.ndarray, params: Pendulum):
+    """
+    Рассчитывает правые части векторной функции для дифференциальных уравнений математического маятника.
+
+    :param t: Время (секунды).
+    :param y: NumPy массив, содержащий текущие значения угла (y[0]) и угловой скорости (y[1]) маятника.
+    :param params: Объект класса Pendulum, содержащий параметры маятника.
+
+    :return: NumPy массив, содержащий правые части дифференциальных уравнений: [y[1], -g/l * sin(y[0])],
+    """
+    alfa = y[0]
+    alfa_dot = y[1]
+    g = params.g
+    l = params.l
+
+    # Вычисление правых частей
+    right_parts = np.array([alfa_dot, -g / l * np.sin(alfa)])
+
+    return right_parts
+
+
+def vector_function_right_parts_batch(t: float, y: np.ndarray, params: Pendulum):
+    """
+    Правые части уравнений математического маятника сразу для N начальных условий.
+
+    :param t: Время (секунды).
+    :param y: NumPy массив (N, 2) с углами (y[:, 0]) и угловыми скоростями (y[:, 1]).
+    :param params: Объект класса Pendulum, содержащий параметры маятника.
+
+    :return: NumPy массив (N, 2) правых частей.
+    """
+    right_parts = np.empty_like(y)
+    right_parts[:, 0] = y[:, 1]
+    right_parts[:, 1] = -params.g / params.l * np.sin(y[:, 0])
+    return right_parts
+
+
+def classify_motion(result_alfa: np.ndarray, result_alfa_dot: np.ndarray) -> np.ndarray:
+    """
+    Определяет тип движения для каждой траектории: колебание, если угловая скорость меняет знак,
+    вращение, если не меняет, а угол изменился больше чем на 2π. Считается сразу для всех траекторий.
+
+    :param result_alfa: NumPy массив (количество точек, N) углов.
+    :param result_alfa_dot: NumPy массив (количество точек, N) угловых скоростей.
+
+    :return: NumPy массив (N,) из LIBRATION, ROTATION и UNDEFINED.
+    """
+    sign_change = np.any(np.sign(result_alfa_dot[1:]) * np.sign(result_alfa_dot[:-1]) < 0, axis=0)
+    full_turn = np.abs(result_alfa[-1] - result_alfa[0]) >= 2 * np.pi
+
+    motion = np.full(result_alfa.shape[1], UNDEFINED)
+    motion[full_turn & ~sign_change] = ROTATION
+    motion[sign_change] = LIBRATION
+    return motion
@@ -0,0 +1,60 @@
+import os
+import sys
+import numpy as np
+from matplotlib import pyplot as plt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from classes import LIBRATION, ROTATION, UNDEFINED, Pendulum, classify_motion, vector_function_right_parts_batch
+from propagation import kernels, propagate
+
+pendulum = Pendulum(g=9.8, l=1.0, m=1.0)
+
+# Сетка начальных условий: все траектории интегрируются одним массивом (N, 2)
+alfa0, alfa_dot0 = np.meshgrid(np.linspace(-np.pi, np.pi, 41), np.linspace(-8, 8, 41))
+y0 = np.column_stack((alfa0.ravel(), alfa_dot0.ravel()))
+pendulum.add_initial_data(t0=0.0, y0=y0)
+
+h = 0.001  # Шаг интегрирования
+n = 10000  # Количество шагов
+every = 10  # Шаг выдачи результатов (в шагах интегрирования)
+
+# Вызов метода Рунге-Кутта 4-го порядка для всех начальных условий сразу (цикл по шагам скомпилирован)
+t, y = propagate(f=lambda t, y: vector_function_right_parts_batch(t, y, params=pendulum), t0=pendulum.t0,
+                 y0=pendulum.y0, h=h, n=n, kernel=kernels.pendulum_batch, params=np.array([pendulum.g, pendulum.l]),
+                 every=every)
+pendulum.add_results(result_t=t, result_alfa=y[:, :, 0], result_alfa_dot=y[:, :, 1])
+
+# Тип движения по траекториям и, для проверки, по энергии: вращение, если энергия больше, чем в верхнем положении
+motion = classify_motion(pendulum.result_alfa, pendulum.result_alfa_dot)
+energy = 0.5 * pendulum.l / pendulum.g * y0[:, 1] ** 2 + 1 - np.cos(y0[:, 0])  # в единицах m g l
+known = motion != UNDEFINED
+print(f"Траекторий: {len(motion)}, колебаний: {np.sum(motion == LIBRATION)}, "
+      f"вращений: {np.sum(motion == ROTATION)}, не определено (около сепаратрисы): {np.sum(~known)}")
+print(f"Совпадает с оценкой по энергии: {np.mean((motion[known] == ROTATION) == (energy[known] > 2)):.1%}")
+
+# Общий фазовый портрет: угол приводится к [-π, π), в точке, где угол перескакивает через границу, линия
+# прерывается (NaN). Траектории одного типа рисуются одной линией, разделённой столбцом NaN
+alfa = np.mod(pendulum.result_alfa + np.pi, 2 * np.pi) - np.pi
+alfa[1:][np.abs(np.diff(alfa, axis=0)) > np.pi] = np.nan
+breaks = np.full((1, len(motion)), np.nan)
+alfa = np.vstack((alfa, breaks))
+alfa_dot = np.vstack((pendulum.result_alfa_dot, breaks))
+
+plt.figure(figsize=(10.5, 7))
+for kind, color, label in ((LIBRATION, 'tab:blue', 'колебания'), (ROTATION, 'tab:orange', 'вращение'),
+                           (UNDEFINED, 'tab:gray', 'не определено')):
+    plt.plot(alfa[:, motion == kind].T.ravel(), alfa_dot[:, motion == kind].T.ravel(), color=color, linewidth=0.5,
+             label=label)
+separatrix = np.linspace(-np.pi, np.pi, 500)
+for sign in (1, -1):
+    plt.plot(separatrix, sign * 2 * np.sqrt(pendulum.g / pendulum.l) * np.cos(separatrix / 2), color='red',
+             linestyle='--', label='сепаратриса' if sign > 0 else None)
+plt.xlim(-np.pi, np.pi)
+plt.ylim(np.min(pendulum.result_alfa_dot), np.max(pendulum.result_alfa_dot))
+plt.title('Фазовый портрет')
+plt.xlabel('alfa, рад')
+plt.ylabel('alfa_dot рад/с')
+plt.legend()
+plt.tight_layout()
+plt.show()
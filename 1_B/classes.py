@@ -1,5 +1,8 @@
+import math
 import numpy as np
 
+from propagation.kernels import pendulum_closed_loop, pendulum_closed_loop_batch
+
 
 class Pendulum:
     t0 = None
@@ -68,12 +71,181 @@ class Pendulum:
             self.m * self.g * self.l * (1 - np.cos(self.result_alfa))
 
 
+class NoiseBuffer:
+    """
+    Поток гауссового шума N(mean, std), который берётся из генератора не по одному числу, а блоками по block_size
+    отсчётов: на каждый отсчёт остаётся только чтение из готового массива.
+    Отсчёт может быть вектором (mean и std - массивы), тогда все его компоненты берутся из одного блока.
+    """
+
+    def __init__(self, rng: np.random.Generator, mean, std, block_size: int = 1024):
+        """
+            Параметры:
+                - rng: генератор случайных чисел numpy.random.Generator
+                - mean: среднее (число или NumPy массив для векторного отсчёта)
+                - std: стандартное отклонение (той же формы, что mean)
+                - block_size: количество отсчётов в одном блоке
+        """
+        self.rng = rng
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.std = np.asarray(std, dtype=np.float64)
+        self.block_size = block_size
+        self.block = None
+        self.index = block_size  # блок ещё не сгенерирован
+
+    def refill(self):
+        """
+            Генерирует следующий блок шума.
+        """
+        shape = (self.block_size,) + np.broadcast_shapes(self.mean.shape, self.std.shape)
+        self.block = self.mean + self.std * self.rng.standard_normal(shape)
+        self.index = 0
+
+    def next(self):
+        """
+            Возвращает следующий отсчёт шума (число или NumPy массив формы mean).
+        """
+        if self.index == self.block_size:
+            self.refill()
+        sample = self.block[self.index]
+        self.index += 1
+        return sample
+
+    def take(self, count: int) -> np.ndarray:
+        """
+            Возвращает следующие count отсчётов одним массивом - те же, что дали бы count вызовов next().
+        """
+        shape = np.broadcast_shapes(self.mean.shape, self.std.shape)
+        samples = np.empty((count,) + shape)
+        filled = 0
+        while filled < count:
+            if self.index == self.block_size:
+                self.refill()
+            part = min(count - filled, self.block_size - self.index)
+            samples[filled:filled + part] = self.block[self.index:self.index + part]
+            self.index += part
+            filled += part
+        return samples
+
+    def get_state(self) -> dict:
+        """
+            Возвращает состояние потока: состояние генератора, текущий блок и позицию в нём
+            (например, для контрольной точки propagation.checkpointed_chunks).
+        """
+        return {"rng": self.rng.bit_generator.state, "block": None if self.block is None else self.block.copy(),
+                "index": self.index}
+
+    def set_state(self, state: dict):
+        """
+            Восстанавливает состояние, возвращённое get_state: следующие отсчёты будут те же, что и после него.
+        """
+        self.rng.bit_generator.state = state["rng"]
+        self.block = None if state["block"] is None else state["block"].copy()
+        self.index = state["index"]
+
+
+class ControlTelemetry:
+    """
+    Журнал управления: для каждого пересчёта управления - время, управление и измеренные угол и угловая скорость.
+    Записи лежат строками в заранее выделенном NumPy массиве (capacity, 4), который при заполнении
+    увеличивается вдвое. Если задан spill_path, заполненный массив вместо увеличения дописывается в файл
+    (для длинных расчётов в памяти остаётся только последний блок).
+    Столбцы t, U, alfa и alfa_dot - представления массива без копирования (например, для plot_subplot).
+    """
+    __slots__ = ("data", "length", "spill_path", "spilled")
+    fields = ("t", "U", "alfa", "alfa_dot")
+
+    def __init__(self, capacity: int = 1024, spill_path: str = None):
+        """
+            Параметры:
+                - capacity: начальное количество записей (или размер блока при spill_path)
+                - spill_path: файл, в который сбрасываются заполненные блоки (перезаписывается)
+        """
+        self.data = np.empty((capacity, len(self.fields)))
+        self.length = 0  # количество записей в памяти
+        self.spill_path = spill_path
+        self.spilled = 0  # количество записей в файле
+        if spill_path is not None:
+            open(spill_path, "wb").close()
+
+    def append(self, t: float, U: float, alfa: float, alfa_dot: float):
+        """
+            Добавляет запись.
+        """
+        if self.length == len(self.data):
+            if self.spill_path is not None:
+                self.spill()
+            else:
+                data = np.empty((2 * len(self.data), len(self.fields)))
+                data[:self.length] = self.data
+                self.data = data
+        self.data[self.length] = (t, U, alfa, alfa_dot)
+        self.length += 1
+
+    def extend(self, records: np.ndarray):
+        """
+            Добавляет сразу много записей (NumPy массив (N, 4)).
+        """
+        records = np.ascontiguousarray(records, dtype=np.float64)
+        if self.spill_path is not None:
+            self.spill()
+            with open(self.spill_path, "ab") as file:
+                file.write(records.tobytes())
+            self.spilled += len(records)
+            return
+
+        end = self.length + len(records)
+        if end > len(self.data):
+            data = np.empty((max(end, 2 * len(self.data)), len(self.fields)))
+            data[:self.length] = self.data[:self.length]
+            self.data = data
+        self.data[self.length:end] = records
+        self.length = end
+
+    def spill(self):
+        """
+            Дописывает записи из памяти в файл spill_path.
+        """
+        with open(self.spill_path, "ab") as file:
+            file.write(self.data[:self.length].tobytes())
+        self.spilled += self.length
+        self.length = 0
+
+    def records(self) -> np.ndarray:
+        """
+            Возвращает все записи массивом (N, 4) без копирования: срез массива в памяти или,
+            если записи сбрасываются в файл, отображённый в память файл.
+        """
+        if self.spill_path is None:
+            return self.data[:self.length]
+        if self.length:
+            self.spill()
+        if self.spilled == 0:
+            return np.empty((0, len(self.fields)))
+        return np.memmap(self.spill_path, dtype=np.float64, mode="r", shape=(self.spilled, len(self.fields)))
+
+    def __len__(self):
+        return self.spilled + self.length
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.records()[:, 0]
+
+    @property
+    def U(self) -> np.ndarray:
+        return self.records()[:, 1]
+
+    @property
+    def alfa(self) -> np.ndarray:
+        return self.records()[:, 2]
+
+    @property
+    def alfa_dot(self) -> np.ndarray:
+        return self.records()[:, 3]
+
+
 class Control:
     U = 0
-    list_U = []
-    list_t = []
-    list_alfa = []
-    list_alfa_dot = []
     mean_glm = 0
     mean_angle = 0
     std_angle = None
@@ -82,19 +254,27 @@ class Control:
     kf_alfa = None
     kf_beta = None
 
-    def __init__(self, params: Pendulum, required_angle: float, std_glm: float = 0.01):
+    def __init__(self, params: Pendulum, required_angle: float, std_glm: float = 0.01, rng=None,
+                 telemetry_path: str = None):
         """
             Инициализирует объект управления.
             Параметры:
                 - params: объект Pendulum с параметрами маятника
                 - required_angle: желаемый угол
                 - std_glm: стандартное отклонение гауссового шума для парматеров маятника  (по умолчанию 0.01)
+                - rng: генератор numpy.random.Generator или зерно для него (по умолчанию - случайное зерно).
+                       Весь шум управления берётся из этого генератора, поэтому с одним зерном расчёт
+                       повторяется, а параллельные расчёты с разными генераторами независимы.
+                - telemetry_path: файл для сброса журнала управления (для длинных расчётов; по умолчанию
+                                  журнал целиком в памяти)
         """
-        self.g_noise = params.g + np.random.normal(self.mean_glm, std_glm)
-        self.l_noise = params.l + np.random.normal(self.mean_glm, std_glm)
-        self.m_noise = params.m + np.random.normal(self.mean_glm, std_glm)
+        self.rng = np.random.default_rng(rng)
+        self.g_noise, self.l_noise, self.m_noise = \
+            np.array([params.g, params.l, params.m]) + self.rng.normal(self.mean_glm, std_glm, size=3)
         self.required_angle = required_angle
         self.std_glm = std_glm
+        self.measurement_noise = None
+        self.telemetry = ControlTelemetry(spill_path=telemetry_path)  # журнал управления этого объекта
 
     def add_control_characteristics(self, time_work: float, kf_alfa: float, kf_beta: float,
                                     std_angle: float, std_angle_dot: float):
@@ -112,15 +292,20 @@ class Control:
         self.kf_beta = kf_beta
         self.std_angle = std_angle
         self.std_angle_dot = std_angle_dot
+        # шум измерений угла и угловой скорости - одним потоком пар (угол, скорость)
+        self.measurement_noise = NoiseBuffer(self.rng, mean=[self.mean_angle, self.mean_angle],
+                                             std=[std_angle, std_angle_dot])
         self.__check_characteristics()
 
     def __check_characteristics(self):
         """
             Проверяет характеристики управления на корректность.
-            Если характеристики некорректны, вызывает исключение.
+            Если характеристики некорректны, вызывает ValueError.
         """
-        if self.kf_beta < 0 or self.kf_alfa - self.g_noise / self.l_noise * np.sin(self.required_angle) > 0:
-            raise Exception
+        if self.kf_beta < 0:
+            raise ValueError(f"Коэффициент kf_beta должен быть неотрицательным: {self.kf_beta}")
+        if self.kf_alfa - self.g_noise / self.l_noise * np.sin(self.required_angle) > 0:
+            raise ValueError(f"Коэффициент kf_alfa = {self.kf_alfa} не даёт устойчивого положения равновесия")
 
     def get_control(self, alfa: float, alfa_dot: float, time_now: float):
         """
@@ -134,15 +319,132 @@ class Control:
             Возвращает:
                 - U: значение управления
         """
-        alfa = alfa + np.random.normal(self.mean_angle, self.std_angle)
-        alfa_dot = alfa_dot + np.random.normal(self.mean_angle, self.std_angle_dot)
+        noise_alfa, noise_alfa_dot = self.measurement_noise.next()
+        alfa = alfa + noise_alfa
+        alfa_dot = alfa_dot + noise_alfa_dot
 
         self.U = self.kf_alfa * (alfa - self.required_angle) - self.kf_beta * alfa_dot + \
                  self.g_noise / self.l_noise * np.sin(self.required_angle)
 
-        self.list_U.append(self.U)
-        self.list_t.append(time_now)
-        self.list_alfa.append(alfa)
-        self.list_alfa_dot.append(alfa_dot)
+        self.telemetry.append(t=time_now, U=self.U, alfa=alfa, alfa_dot=alfa_dot)
+
+        return self.U
+
+    def get_state(self) -> dict:
+        """
+            Возвращает состояние управления, от которого зависит продолжение расчёта: текущее управление U
+            и состояние шума измерений (генератор и уже сгенерированный блок). Журнал управления не входит.
+            Объект Control можно передать как rng в propagation.checkpointed_chunks - тогда продолжение
+            с контрольной точки совпадает с расчётом без перерыва бит в бит.
+        """
+        return {"U": self.U, "rng": self.rng.bit_generator.state,
+                "noise": None if self.measurement_noise is None else self.measurement_noise.get_state()}
+
+    def set_state(self, state: dict):
+        """
+            Восстанавливает состояние, возвращённое get_state.
+        """
+        self.U = state["U"]
+        self.rng.bit_generator.state = state["rng"]
+        if state["noise"] is not None:
+            self.measurement_noise.set_state(state["noise"])
+
+    def closed_loop(self, pendulum: Pendulum, h: float, n: int, sink=None) -> tuple:
+        """
+            Моделирует маятник с этим управлением в одном скомпилированном цикле (pendulum_closed_loop):
+            дискретное ПД-управление и метод Рунге-Кутта 4-го порядка вместе, шум измерений берётся из
+            measurement_noise одним блоком. Траектория и журнал управления те же, что у propagate с sampling_hook.
+
+            Параметры:
+                - pendulum: объект Pendulum с начальными данными
+                - h: шаг интегрирования
+                - n: количество шагов
+                - sink: приёмник результатов sink(t, y), как у propagate
+
+            Возвращает:
+                - массив значений t и массив значений y
+        """
+        period_U = math.ceil(self.time_work / h)
+        noise = self.measurement_noise.take((n - 1) // period_U + 1 if n > 0 else 0)
+        control = np.array([self.kf_alfa, self.kf_beta, self.required_angle,
+                            self.g_noise / self.l_noise * np.sin(self.required_angle)], dtype=np.float64)
+
+        t, y, telemetry = pendulum_closed_loop(float(pendulum.t0), np.asarray(pendulum.y0, dtype=np.float64), float(h),
+                                               int(n), np.array([pendulum.g, pendulum.l], dtype=np.float64), control,
+                                               period_U, noise)
+        self.telemetry.extend(telemetry)
+        if len(telemetry):
+            self.U = telemetry[-1, 1]
+
+        if sink is not None:
+            sink(t, y)
+        return t, y
+
+    def sampling_hook(self, h: float):
+        """
+            Возвращает функцию step_hook(i, t, y) для propagate, которая учитывает дискретность управления:
+            управление пересчитывается раз в time_work и держится постоянным между пересчётами.
+
+            Параметры:
+                - h: шаг интегрирования
+
+            Возвращает:
+                - step_hook: функция, вызываемая перед каждым шагом интегрирования
+        """
+        period_U = math.ceil(self.time_work / h)
+
+        def step_hook(i: int, t: float, y: np.ndarray):
+            if i % period_U == 0:
+                self.get_control(alfa=y[0], alfa_dot=y[1], time_now=t)
+
+        return step_hook
+
+
+def monte_carlo(pendulum: Pendulum, required_angle: float, time_work: float, kf_alfa: float, kf_beta: float,
+                std_angle: float, std_angle_dot: float, h: float, n: int, count: int, std_glm: float = 0.01,
+                settle_band: float = 0.01, rng=None) -> dict:
+    """
+        Моделирует count реализаций маятника с зашумлённым управлением сразу (метод Монте-Карло): у каждой
+        реализации свои оценки g, l и m (как в конструкторе Control) и свой шум измерений, сгенерированный заранее
+        одним массивом. Все реализации считаются в одном скомпилированном цикле (pendulum_closed_loop_batch);
+        каждая из них даёт ту же траекторию, что и Control.closed_loop с тем же шумом.
+
+        Параметры:
+            - pendulum: объект Pendulum с начальными данными
+            - required_angle: желаемый угол
+            - time_work, kf_alfa, kf_beta, std_angle, std_angle_dot: характеристики управления, как в
+              Control.add_control_characteristics
+            - h: шаг интегрирования
+            - n: количество шагов
+            - count: количество реализаций
+            - std_glm: стандартное отклонение шума параметров маятника
+            - settle_band: угол считается установившимся, если отличается от требуемого меньше чем на settle_band
+            - rng: генератор numpy.random.Generator или зерно для него
+
+        Возвращает:
+            - словарь NumPy массивов (count,): "settling_time" - время установления, "final_error" - ошибка угла
+              и "final_alfa_dot" - угловая скорость в конце расчёта, "valid" - коэффициенты дают устойчивое
+              положение равновесия при оценках g и l этой реализации (для остальных метрики равны NaN)
+    """
+    rng = np.random.default_rng(rng)
+    g_noise, l_noise, _ = (np.array([pendulum.g, pendulum.l, pendulum.m]) +
+                           rng.normal(Control.mean_glm, std_glm, size=(count, 3))).T
+    period_U = math.ceil(time_work / h)
+    noise = Control.mean_angle + np.array([std_angle, std_angle_dot]) * \
+        rng.standard_normal(((n - 1) // period_U + 1 if n > 0 else 0, count, 2))
+
+    hold = g_noise / l_noise * np.sin(required_angle)
+    control = np.column_stack((np.full(count, kf_alfa), np.full(count, kf_beta), np.full(count, required_angle),
+                               hold))
+    valid = (kf_beta >= 0) & (kf_alfa - hold <= 0)  # та же проверка, что в Control.__check_characteristics
+
+    y0 = np.ascontiguousarray(np.broadcast_to(np.asarray(pendulum.y0, dtype=np.float64), (count, 2)))
+    y, settling = pendulum_closed_loop_batch(float(pendulum.t0), y0, float(h), int(n),
+                                             np.array([pendulum.g, pendulum.l], dtype=np.float64), control, period_U,
+                                             noise, float(settle_band))
 
-        return self.U
\ No newline at end of file
+    result = {"settling_time": settling, "final_error": y[:, 0] - required_angle, "final_alfa_dot": y[:, 1],
+              "valid": valid}
+    for name in ("settling_time", "final_error", "final_alfa_dot"):
+        result[name][~valid] = np.nan
+    return result
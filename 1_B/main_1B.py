@@ -1,8 +1,12 @@
+import os
+import sys
 import numpy as np
 from matplotlib import pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import propagate
 from classes import Pendulum, Control
-from rkk4 import runge_kutta_4
 from grafics import plot_subplot
 
 # Начальные данные
@@ -21,28 +25,41 @@ time_work_of_control = 0.1  # min время работы управления
 std_angle = 0.01  # шум угла
 std_angle_dot = 0.03  # шум угловой скорости
 
-control = Control(params=pendulum, required_angle=required_angle)
+seed = 0  # зерно генератора шума (None - каждый запуск со своим шумом)
+
+control = Control(params=pendulum, required_angle=required_angle, rng=seed)
 control.add_control_characteristics(time_work=time_work_of_control, kf_alfa=kf_alfa, kf_beta=kf_beta,
                                     std_angle=std_angle, std_angle_dot=std_angle_dot)
 
-# Вызов метода Рунге-Кутта 4-го порядка
+# Вызов метода Рунге-Кутта 4-го порядка вместе с дискретным управлением
 h = 0.01  # Шаг интегрирования
 n = 800  # Количество шагов
+# True - управление и интегрирование в одном скомпилированном цикле, False - управление на Python через
+# step_hook (тот же результат, медленнее)
+compiled_loop = True
+
+
+def save_results(t: np.ndarray, y: np.ndarray):
+    pendulum.add_results(result_t=t, result_alfa=y[:, 0], result_alfa_dot=y[:, 1])
+
 
-runge_kutta_4(f=pendulum.vector_function_right_parts, t0=pendulum.t0, y0=pendulum.y0,
-              h=h, n=n, control=control, pendulum=pendulum)
+if compiled_loop:
+    control.closed_loop(pendulum=pendulum, h=h, n=n, sink=save_results)
+else:
+    propagate(f=lambda t, y: pendulum.vector_function_right_parts(t, y, U=control.U), t0=pendulum.t0, y0=pendulum.y0,
+              h=h, n=n, step_hook=control.sampling_hook(h=h), sink=save_results)
 
 # Создаем графики
 plt.figure(figsize=(10.5, 7))
 plot_subplot(221, pendulum.result_t, pendulum.result_alfa, 'Угол от времени', 't, c', 'alfa, рад',
-             axhline=required_angle, scatter=[control.list_t, control.list_alfa])
+             axhline=required_angle, scatter=[control.telemetry.t, control.telemetry.alfa])
 
 plot_subplot(222, pendulum.result_t, pendulum.result_alfa_dot, 'Угловая скорость от времени', 't, c',
-             'alfa_dot рад/с', axhline=0, scatter=[control.list_t, control.list_alfa_dot])
+             'alfa_dot рад/с', axhline=0, scatter=[control.telemetry.t, control.telemetry.alfa_dot])
 
 plot_subplot(223, pendulum.result_alfa, pendulum.result_alfa_dot, 'Фазовая картина движения', 'alfa, рад',
              'alfa_dot рад/с')
-plot_subplot(224, control.list_t, control.list_U, 'Управление от времени', 't, c', 'U')
+plot_subplot(224, control.telemetry.t, control.telemetry.U, 'Управление от времени', 't, c', 'U')
 
 plt.tight_layout()
 plt.show()
@@ -0,0 +1,76 @@
+import os
+import sys
+import numpy as np
+from matplotlib import pyplot as plt
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from classes import Pendulum, monte_carlo
+
+import time
+# Засекаем время перед выполнением кода
+start_time = time.time()
+
+# Начальные данные
+t0 = 0.0
+alfa0 = np.pi/3  # начальный угол
+alfa_dot0 = -2  # начальная угловая скорость
+
+pendulum = Pendulum(g=9.8, l=1.0, m=1.0)
+pendulum.add_initial_data(t0=t0, y0=np.array([alfa0, alfa_dot0]))
+
+# Данные об управлении (как в main_1B.py)
+required_angle = np.pi/4
+kf_alfa = -2  # кф управления альфа
+kf_beta = 3  # кф управления бета
+time_work_of_control = 0.1  # min время работы управления
+std_angle = 0.01  # шум угла
+std_angle_dot = 0.03  # шум угловой скорости
+settle_band = 0.01  # угол считается установившимся, если отличается от требуемого меньше чем на settle_band (рад)
+
+h = 0.01  # Шаг интегрирования
+n = 800  # Количество шагов
+count = 10000  # Количество реализаций
+seed = 0  # зерно генератора шума (None - каждый запуск со своим шумом)
+
+result = monte_carlo(pendulum=pendulum, required_angle=required_angle, time_work=time_work_of_control,
+                     kf_alfa=kf_alfa, kf_beta=kf_beta, std_angle=std_angle, std_angle_dot=std_angle_dot, h=h, n=n,
+                     count=count, settle_band=settle_band, rng=seed)
+valid = result["valid"]
+settling_time = result["settling_time"][valid]
+final_error = result["final_error"][valid]
+# Реализация не установилась, если угол вышел из полосы settle_band в последней точке расчёта
+settled = settling_time < n * h - h / 2
+
+print(f"Реализаций: {count}, некорректных коэффициентов: {np.sum(~valid)}, "
+      f"установилось за {n * h:g} с: {np.mean(settled):.1%}")
+
+# Распределения времени установления и итоговой ошибки угла
+table = PrettyTable()
+table.field_names = ["Величина", "Среднее", "5%", "50%", "95%", "Максимум"]
+for name, values in (("Время установления, с", settling_time[settled]), ("Итоговая ошибка угла, рад", final_error)):
+    table.add_row([name, f"{np.mean(values):.4g}"] + [f"{value:.4g}" for value in np.percentile(values, [5, 50, 95])] +
+                  [f"{np.max(values):.4g}"])
+print(table)
+
+# Вычисляем время выполнения
+execution_time = time.time() - start_time
+print(f"Execution time: {execution_time} seconds")
+
+# Создаем графики
+plt.figure(figsize=(10.5, 4))
+plt.subplot(121)
+plt.hist(settling_time[settled], bins=50)
+plt.title('Время установления')
+plt.xlabel('t, c')
+plt.ylabel('Количество реализаций')
+
+plt.subplot(122)
+plt.hist(final_error, bins=50)
+plt.title('Итоговая ошибка угла')
+plt.xlabel('alfa - required, рад')
+plt.ylabel('Количество реализаций')
+
+plt.tight_layout()
+plt.show()
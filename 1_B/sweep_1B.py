@@ -0,0 +1,72 @@
+import os
+import sys
+import numpy as np
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import grid, run_sweep
+from classes import Pendulum, Control
+
+# Начальные данные
+t0 = 0.0
+alfa0 = np.pi/3  # начальный угол
+alfa_dot0 = -2  # начальная угловая скорость
+
+# Данные об управлении
+required_angle = np.pi/4
+time_work_of_control = 0.1  # min время работы управления
+std_angle = 0.01  # шум угла
+std_angle_dot = 0.03  # шум угловой скорости
+
+h = 0.01  # Шаг интегрирования
+n = 800  # Количество шагов
+
+
+def control_worker(config: dict) -> dict:
+    """
+    Моделирует маятник с управлением с коэффициентами (kf_alfa, kf_beta) из config и возвращает итоговые метрики:
+    ошибку конечного угла, конечную угловую скорость и максимальную ошибку угла на последней четверти времени.
+    """
+    pendulum = Pendulum(g=9.8, l=1.0, m=1.0)
+    pendulum.add_initial_data(t0=t0, y0=np.array([alfa0, alfa_dot0]))
+    # у каждого сценария свой поток шума, который не зависит от того, в каком процессе он считается
+    control = Control(params=pendulum, required_angle=required_angle, rng=config.get("seed", 0))
+    try:
+        control.add_control_characteristics(time_work=time_work_of_control, kf_alfa=config["kf_alfa"],
+                                            kf_beta=config["kf_beta"], std_angle=std_angle,
+                                            std_angle_dot=std_angle_dot)
+    except ValueError:
+        # Коэффициенты не проходят проверку устойчивости
+        return {"valid": False, "angle_error": np.nan, "alfa_dot": np.nan, "tail_error": np.nan}
+
+    control.closed_loop(pendulum=pendulum, h=h, n=n,
+                        sink=lambda t, y: pendulum.add_results(result_t=t, result_alfa=y[:, 0],
+                                                               result_alfa_dot=y[:, 1]))
+
+    error = pendulum.result_alfa - required_angle
+    return {
+        "valid": True,
+        "angle_error": abs(error[-1]),
+        "alfa_dot": pendulum.result_alfa_dot[-1],
+        "tail_error": np.max(np.abs(error[-len(error) // 4:])),
+    }
+
+
+if __name__ == '__main__':
+    # Сетка сценариев: коэффициенты управления
+    configs = grid(kf_alfa=[-1, -2, -5, -10], kf_beta=[0.5, 1, 3, 6])
+    # независимые потоки шума для сценариев из одного зерна
+    for config, seed in zip(configs, np.random.SeedSequence(0).spawn(len(configs))):
+        config["seed"] = seed
+    rows = run_sweep(control_worker, configs)
+
+    table = PrettyTable()
+    table.field_names = ["kf_alfa", "kf_beta", "Ошибка угла", "Угловая скорость", "Макс. ошибка (посл. 1/4)"]
+    for row in rows:
+        if row["valid"]:
+            table.add_row([row["kf_alfa"], row["kf_beta"], f"{row['angle_error']:.3e}", f"{row['alfa_dot']:.3e}",
+                           f"{row['tail_error']:.3e}"])
+        else:
+            table.add_row([row["kf_alfa"], row["kf_beta"], "некорректные коэффициенты", "-", "-"])
+    print(table)
@@ -0,0 +1,113 @@
+import math
+import os
+import sys
+import numpy as np
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import grid, run_search
+from classes import Pendulum, Control
+
+# Начальные данные
+t0 = 0.0
+alfa0 = np.pi/3  # начальный угол
+alfa_dot0 = -2  # начальная угловая скорость
+
+# Данные об управлении
+required_angle = np.pi/4
+std_angle = 0.01  # шум угла
+std_angle_dot = 0.03  # шум угловой скорости
+seed = 0  # один и тот же шум для всех кандидатов, чтобы их стоимости были сравнимы
+
+h = 0.01  # Шаг интегрирования
+n = 800  # Количество шагов
+segment = 100  # Количество шагов между проверками отсечения
+
+# Стоимость кандидата: время установления + штраф за перерегулирование + штраф за затраты на управление
+settle_band = 0.01  # угол считается установившимся, если отличается от требуемого меньше чем на settle_band (рад)
+divergence = np.pi  # расчёт прекращается, если ошибка угла больше divergence (рад)
+weight_overshoot = 10  # с на рад перерегулирования
+weight_effort = 0.01  # с на единицу интеграла (U - U_удержания)^2 dt
+
+
+def tuning_cost(settling_time: float, overshoot: float, effort: float) -> float:
+    return settling_time + weight_overshoot * overshoot + weight_effort * effort
+
+
+def tuning_worker(config: dict) -> dict:
+    """
+    Моделирует маятник с управлением с параметрами (kf_alfa, kf_beta, time_work) из config по кускам и считает
+    стоимость: время установления, перерегулирование и затраты на управление. Все три величины за пройденную
+    часть расчёта только растут, поэтому стоимость по ней - нижняя оценка итоговой; расчёт прерывается, как только
+    она превысила config["bound"] (лучшую стоимость среди уже посчитанных кандидатов) или угол разошёлся.
+    """
+    bound = config.get("bound", math.inf)
+    result = {"status": "ok", "cost": math.inf, "settling_time": np.nan, "overshoot": np.nan, "effort": np.nan}
+
+    pendulum = Pendulum(g=9.8, l=1.0, m=1.0)
+    pendulum.add_initial_data(t0=t0, y0=np.array([alfa0, alfa_dot0]))
+    control = Control(params=pendulum, required_angle=required_angle, rng=seed)
+    try:
+        control.add_control_characteristics(time_work=config["time_work"], kf_alfa=config["kf_alfa"],
+                                            kf_beta=config["kf_beta"], std_angle=std_angle,
+                                            std_angle_dot=std_angle_dot)
+    except ValueError:
+        return dict(result, status="некорректные коэффициенты")
+
+    # Куски из целого числа периодов управления - тот же расчёт, что и одним куском
+    period_U = math.ceil(control.time_work / h)
+    steps_per_segment = period_U * max(1, segment // period_U)
+    direction = np.sign(required_angle - alfa0)  # с какой стороны угол подходит к требуемому
+    # затраты считаются сверх управления, которое нужно, чтобы просто удерживать требуемый угол
+    U_hold = control.g_noise / control.l_noise * np.sin(required_angle)
+
+    done = 0
+    last_outside = overshoot = 0.0
+    while done < n:
+        t, y = control.closed_loop(pendulum=pendulum, h=h, n=min(steps_per_segment, n - done))
+        pendulum.add_initial_data(t0=t[-1], y0=y[-1])
+        done += len(t) - 1
+
+        error = y[:, 0] - required_angle
+        if not np.all(np.isfinite(y)) or np.max(np.abs(error)) > divergence:
+            return dict(result, status="расходится")
+
+        outside = np.nonzero(np.abs(error) > settle_band)[0]
+        if len(outside):
+            last_outside = t[outside[-1]] - t0
+        overshoot = max(overshoot, np.max(error * direction))
+        effort = np.sum((control.telemetry.U - U_hold) ** 2) * period_U * h
+
+        cost = tuning_cost(last_outside, overshoot, effort)
+        if cost > bound:
+            return dict(result, status="отсечён", cost=cost)
+
+    return dict(result, cost=cost, settling_time=last_outside, overshoot=overshoot, effort=effort)
+
+
+def print_table(rows: list, count: int = 10):
+    table = PrettyTable()
+    table.field_names = ["kf_alfa", "kf_beta", "time_work", "Стоимость", "Время установления", "Перерегулирование",
+                         "Затраты"]
+    for row in sorted(rows, key=lambda row: row["cost"])[:count]:
+        table.add_row([f"{row['kf_alfa']:.3g}", f"{row['kf_beta']:.3g}", row["time_work"], f"{row['cost']:.3f}",
+                       f"{row['settling_time']:.2f}", f"{row['overshoot']:.3e}", f"{row['effort']:.1f}"])
+    print(table)
+
+
+if __name__ == '__main__':
+    # Грубая сетка, затем мелкая сетка вокруг лучшего кандидата (с его стоимостью как начальной границей)
+    configs = grid(kf_alfa=-np.geomspace(0.5, 50, 12), kf_beta=np.geomspace(0.25, 25, 12),
+                   time_work=[0.01, 0.05, 0.1, 0.2])
+    rows = run_search(tuning_worker, configs)
+    best = min(rows, key=lambda row: row["cost"])
+
+    configs = grid(kf_alfa=best["kf_alfa"] * np.geomspace(0.7, 1.4, 9),
+                   kf_beta=best["kf_beta"] * np.geomspace(0.7, 1.4, 9), time_work=[best["time_work"]])
+    rows += run_search(tuning_worker, configs, bound=best["cost"])
+
+    statuses = [row["status"] for row in rows]
+    print(f"Кандидатов: {len(rows)}, досчитано: {statuses.count('ok')}, отсечено: {statuses.count('отсечён')}, "
+          f"расходится: {statuses.count('расходится')}, некорректных: {statuses.count('некорректные коэффициенты')}")
+    print_table([row for row in rows if row["status"] == "ok"])
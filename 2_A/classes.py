@@ -1,5 +1,8 @@
 import numpy as np
 
+from propagation.elements import xyz_to_elements
+from propagation.kernels import two_body, two_body_batch
+
 
 class Orbit:
     t0 = 0
@@ -9,7 +12,8 @@ class Orbit:
     result_a = result_e = result_i = result_w = result_omega = result_nu = None
     result_c = result_E = result_f = None
 
-    def __init__(self, a: float, e: float, i: float, w: float, omega: float, nu: float, mu: float):
+    def __init__(self, a: float, e: float, i: float, w: float, omega: float, nu: float, mu: float,
+                 compiled_rhs: bool = True):
         """
         Конструктор класса, который инициализирует объект орбиты с заданными параметрами.
 
@@ -20,6 +24,7 @@ class Orbit:
             :param omega: Долгота восходящего узла.
             :param nu: Истиная аномалия.
             :param mu: Гравитационный параметр.
+            :param compiled_rhs: Считать правые части скомпилированным ядром (numba, если установлена).
         """
         self.a = a  # Большая полуось
         self.e = e  # Эксцентриситет
@@ -28,6 +33,10 @@ class Orbit:
         self.omega = omega  # Долгота восходящего узла
         self.nu = nu  # Истиная аномалия
         self.mu = mu  # Гравитационный параметр
+        self.compiled_rhs = compiled_rhs
+        self.rhs_params = np.array([mu])  # Параметры для ядра правых частей
+        self.rhs_kernel = two_body  # Ядро правых частей
+        self.rhs_batch_kernel = two_body_batch  # Ядро правых частей для N спутников сразу
 
         # добавляем начальные данные
         self.y0 = self.from_elements_to_xyz(a=a, e=e, i=i, w=w, omega=omega, nu=nu)
@@ -41,6 +50,9 @@ class Orbit:
 
         :return: NumPy массив, содержащий правые части дифференциальных уравнений задачи двух тел
         """
+        if self.compiled_rhs:
+            return self.rhs_kernel(t, y, self.rhs_params, np.empty(6))
+
         right_parts = np.zeros(6)
         for i in range(3):
             right_parts[i] = y[i+3]
@@ -48,6 +60,23 @@ class Orbit:
 
         return right_parts
 
+    def vector_function_right_parts_batch(self, t: float, y: np.ndarray):
+        """
+        Рассчитывает правые части задачи двух тел сразу для N спутников.
+
+            :param t: Время (секунды).
+            :param y: NumPy массив (N, 6) с векторами состояния спутников.
+
+        :return: NumPy массив (N, 6) с правыми частями дифференциальных уравнений
+        """
+        r = y[:, 0:3]
+        r_norm = np.sqrt(np.einsum('ij,ij->i', r, r))
+
+        right_parts = np.empty_like(y)
+        right_parts[:, 0:3] = y[:, 3:6]
+        right_parts[:, 3:6] = - self.mu * r / (r_norm ** 3)[:, np.newaxis]
+        return right_parts
+
     def from_elements_to_xyz(self, a: float, e: float, i: float, w: float, omega: float, nu: float):
         """
         Рассчитывает вектор состояния в декартовой системе координат по орбитальным элементам.
@@ -134,6 +163,17 @@ class Orbit:
 
         return np.array([a, e, i, w, omega, nu])
 
+    def from_xyz_to_elements_batch(self, xyz_coords: np.ndarray):
+        """
+        Рассчитывает орбитальные элементы сразу для всех векторов состояния (без цикла Python).
+        Совпадает с from_xyz_to_elements для каждой строки с точностью до нескольких ULP (другой порядок операций).
+
+            :param xyz_coords: NumPy массив (N, 6) с векторами состояния в декартовых координатах.
+
+            :return: NumPy массив (N, 6) с орбитальными элементами (a, e, i, w, omega, nu).
+        """
+        return xyz_to_elements(xyz_coords, mu=self.mu)
+
     def calculate_first_integrals(self, y: np.ndarray):
         """
         Рассчитывает три первых интреграла E, c, f.
@@ -156,7 +196,7 @@ class Orbit:
 
         # Получим элементы орбиты в каждый момент времени
         self.result_a, self.result_e, self.result_i, self.result_w, self.result_omega, self.result_nu = \
-            np.array(list(map(self.from_xyz_to_elements, y))).T
+            self.from_xyz_to_elements_batch(y).T
 
         # Cчитаем первые интегралы
         self.calculate_first_integrals(y=y)
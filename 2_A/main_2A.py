@@ -1,7 +1,11 @@
+import os
+import sys
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import ResultCache, cached_chunks, stream
 from classes import Orbit
-from rkk4 import runge_kutta_4
 from grafics import start_plot
 
 a = (6371 + 410) * 1000 * 3  # Большая полуось
@@ -13,10 +17,14 @@ nu = 0.1 * np.pi  # Истиная аномалия
 mu = 3.986 * 10 ** 14  # Гравитационный параметр
 orbit = Orbit(a=a, e=e, i=i, omega=omega, w=w, nu=nu, mu=mu)
 
-# Вызов метода Рунге-Кутта 4-го порядка
+# Вызов метода Рунге-Кутта 4-го порядка (цикл по шагам скомпилирован)
 h = 0.1  # Шаг интегрирования по времени
 n = 570000  # Количество шагов
-runge_kutta_4(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=n, orbit=orbit)
+dt_out = 1.0  # Шаг выдачи результатов (элементы орбиты считаются только в точках выдачи)
+# Если такой сценарий уже считался, траектория берётся из кэша на диске без интегрирования
+cache = ResultCache()
+stream(cached_chunks(cache, model="2_A.Orbit", f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0,
+                     h=h, n=n, kernel=orbit.rhs_kernel, params=orbit.rhs_params, dt_out=dt_out), orbit.add_results)
 
 # строим графики
 start_plot(orbit=orbit)
\ No newline at end of file
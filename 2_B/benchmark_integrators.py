@@ -0,0 +1,60 @@
+import math
+import os
+import sys
+import time
+import numpy as np
+from datetime import datetime
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import propagate
+from classes import Orbit
+
+
+class EnergyOrbit(Orbit):
+    def add_results(self, t: np.ndarray, y: np.ndarray):
+        """
+        Сохраняет только время и интеграл энергии, чтобы не тратить время на пересчёт в элементы орбиты.
+        """
+        self.result_t = t
+        self.calculate_first_integral(y=y)
+
+
+a = 8059 * 1000  # Большая полуось
+e = 0.15  # Эксцентриситет
+i = 1.2  # Наклонение
+omega = 0.7  # Долгота восходящего узла
+w = 1.37  # Аргумент перицентра
+nu = 0.0  # Истиная аномалия
+mu = 3.986004418 * 10 ** 14  # Гравитационный параметр
+start_datetime = datetime(2023, 11, 14, 19, 00)  # Заданные дата и время начала моделирования
+
+T = 2 * np.pi * a ** 1.5 / mu ** 0.5  # Период обращения
+revolutions = 2  # Количество витков
+
+# Методы и шаги интегрирования, которые сравниваем
+cases = [
+    ("rk4", [0.2, 1, 5, 10]),
+    ("dopri45", [10]),
+    ("verlet", [0.2, 1]),
+    ("yoshida4", [1, 5, 10]),
+    ("stormer_cowell", [5, 10, 20, 30]),
+]
+
+table = PrettyTable()
+table.field_names = ["Метод", "Шаг, с", "Шагов", "Время, с", "Разброс E"]
+for method, steps in cases:
+    for h in steps:
+        orbit = EnergyOrbit(a=a, e=e, i=i, omega=omega, w=w, nu=nu, mu=mu, start_datetime=start_datetime)
+        n = math.ceil(revolutions * T / h)
+
+        start_time = time.time()
+        propagate(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=n, method=method,
+                  sink=orbit.add_results)
+        execution_time = time.time() - start_time
+
+        table.add_row([method, h, len(orbit.result_t) - 1, round(execution_time, 3),
+                       f"{np.max(orbit.result_E) - np.min(orbit.result_E):.3e}"])
+
+print(table)
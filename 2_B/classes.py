@@ -1,6 +1,12 @@
 import numpy as np
 from datetime import datetime
 
+from propagation.analytic import mean_elements_states
+from propagation.dense import Trajectory
+from propagation.elements import xyz_to_elements
+from propagation.events import EventDetector
+from propagation.kernels import j2, j2_batch
+
 
 class Orbit:
     t0 = 0
@@ -9,9 +15,11 @@ class Orbit:
     result_x = result_y = result_z = result_dotx = result_doty = result_dotz = None
     result_a = result_e = result_i = result_w = result_omega = result_nu = None
     result_E = None
+    trajectory = None  # Плотная выдача: состояние в любой момент времени (trajectory.at)
+    events = None  # Приёмник для propagate/stream: моменты и состояния в перицентре и восходящем узле (events.get)
 
     def __init__(self, a: float, e: float, i: float, w: float, omega: float, nu: float,
-                 mu: float, start_datetime: datetime):
+                 mu: float, start_datetime: datetime, compiled_rhs: bool = True):
         """
         Конструктор класса, который инициализирует объект орбиты с заданными параметрами.
 
@@ -23,6 +31,7 @@ class Orbit:
             :param nu: Истиная аномалия.
             :param mu: Гравитационный параметр.
             :param start_datetime: Дата и время начальных параметров.
+            :param compiled_rhs: Считать правые части скомпилированным ядром (numba, если установлена).
 
         """
         self.a = a  # Большая полуось
@@ -32,10 +41,16 @@ class Orbit:
         self.omega = omega  # Долгота восходящего узла
         self.nu = nu  # Истиная аномалия
         self.mu = mu  # Гравитационный параметр
+        self.compiled_rhs = compiled_rhs
+        self.rhs_params = np.array([mu, 1082.8 * 10 ** -6, 6378 * 10 ** 3])  # Параметры для ядра правых частей
+        self.rhs_kernel = j2  # Ядро правых частей
+        self.rhs_batch_kernel = j2_batch  # Ядро правых частей для N спутников сразу
         self.start_datetime = start_datetime
 
         # добавляем начальные данные
         self.y0 = self.from_elements_to_xyz(a=a, e=e, i=i, w=w, omega=omega, nu=nu)
+        # события ищутся по ходу интегрирования: events передаётся в stream вместе с остальными приёмниками
+        self.events = EventDetector(f=self.vector_function_right_parts)
 
     def vector_function_right_parts(self, t: float, y: np.ndarray):
         """
@@ -46,6 +61,9 @@ class Orbit:
 
         :return: NumPy массив, содержащий правые части дифференциальных уравнений задачи двух тел
         """
+        if self.compiled_rhs:
+            return self.rhs_kernel(t, y, self.rhs_params, np.empty(6))
+
         # Радиус Земли в метрах
         R = 6378 * 10 ** 3
         # Коэффициент J2, характеризующий асимметрию массы Земли
@@ -61,6 +79,29 @@ class Orbit:
         right_parts[3:6] = - self.mu * y[0:3] / (np.linalg.norm(y[0:3])) ** 3 + WJ2
         return right_parts
 
+    def vector_function_right_parts_batch(self, t: float, y: np.ndarray):
+        """
+        Рассчитывает правые части задачи двух тел с учётом J2 сразу для N спутников.
+
+            :param t: Время (секунды).
+            :param y: NumPy массив (N, 6) с векторами состояния спутников.
+
+        :return: NumPy массив (N, 6) с правыми частями дифференциальных уравнений
+        """
+        mu, J2, R = self.rhs_params
+        x, y_, z = y[:, 0], y[:, 1], y[:, 2]
+        rho2 = x ** 2 + y_ ** 2
+        r_norm = np.sqrt(rho2 + z ** 2)
+        k = - mu / r_norm ** 3
+        k_j2 = 3/2 * J2 * mu * R ** 2 / r_norm ** 7
+
+        right_parts = np.empty_like(y)
+        right_parts[:, 0:3] = y[:, 3:6]
+        right_parts[:, 3] = k * x - k_j2 * x * (rho2 - 4 * z ** 2)
+        right_parts[:, 4] = k * y_ - k_j2 * y_ * (rho2 - 4 * z ** 2)
+        right_parts[:, 5] = k * z + k_j2 * (-3 * z * rho2 + 2 * z ** 3)
+        return right_parts
+
     def from_elements_to_xyz(self, a: float, e: float, i: float, w: float, omega: float, nu: float):
         """
         Рассчитывает вектор состояния в декартовой системе координат по орбитальным элементам.
@@ -147,6 +188,17 @@ class Orbit:
 
         return np.array([a, e, i, w, omega, nu])
 
+    def from_xyz_to_elements_batch(self, xyz_coords: np.ndarray):
+        """
+        Рассчитывает орбитальные элементы сразу для всех векторов состояния (без цикла Python).
+        Совпадает с from_xyz_to_elements для каждой строки с точностью до нескольких ULP (другой порядок операций).
+
+            :param xyz_coords: NumPy массив (N, 6) с векторами состояния в декартовых координатах.
+
+            :return: NumPy массив (N, 6) с орбитальными элементами (a, e, i, w, omega, nu).
+        """
+        return xyz_to_elements(xyz_coords, mu=self.mu)
+
     def calculate_first_integral(self, y: np.ndarray):
         """
         Рассчитывает три первых интреграла E, c, f.
@@ -165,20 +217,55 @@ class Orbit:
 
     def add_results(self, t: np.ndarray, y: np.ndarray):
         """
-        Добавляет результаты расчетов.
+        Добавляет результаты расчетов (события находит приёмник events, его нужно передать в stream отдельно).
         """
         self.result_t = t
+        self.trajectory = Trajectory(t, y, f=self.vector_function_right_parts, second_order=True)
 
         # Разделите координаты на компоненты x, y и z и так далее
         self.result_x, self.result_y, self.result_z, self.result_dotx, self.result_doty, self.result_dotz = y.T
 
         # Получим элементы орбиты в каждый момент времени
         self.result_a, self.result_e, self.result_i, self.result_w, self.result_omega, self.result_nu = \
-            np.array(list(map(self.from_xyz_to_elements, y))).T
+            self.from_xyz_to_elements_batch(y).T
 
         # Cчитаем первые интегралы
         self.calculate_first_integral(y=y)
 
+    def add_stored_results(self, trajectory):
+        """
+        Добавляет результаты расчетов, сохранённые на диск (propagation.store.StoredTrajectory),
+        без повторного интегрирования. Координаты и элементы орбиты остаются отображёнными в память.
+        События находит приёмник events, его нужно передать в stream при расчёте или вызвать по сохранённой траектории.
+        """
+        self.result_t = trajectory.t
+        self.trajectory = Trajectory(trajectory.t, trajectory.y, f=self.vector_function_right_parts, second_order=True)
+        self.result_x, self.result_y, self.result_z, self.result_dotx, self.result_doty, self.result_dotz = \
+            trajectory.y.T
+
+        elements = trajectory.elements
+        if elements is None:
+            elements = self.from_xyz_to_elements_batch(trajectory.y)
+        self.result_a, self.result_e, self.result_i, self.result_w, self.result_omega, self.result_nu = elements.T
+
+        # Cчитаем первые интегралы
+        self.calculate_first_integral(y=trajectory.y)
+
+    def propagate_mean_elements(self, t: np.ndarray, short_period: bool = True) -> tuple:
+        """
+        Быстрый аналитический прогноз по средним элементам с вековыми скоростями J2 (без интегрирования,
+        O(1) на каждый момент времени). Подходит для быстрой оценки большого числа вариантов; точный расчёт -
+        численное интегрирование propagate.
+
+            :param t: NumPy массив моментов времени.
+            :param short_period: Учитывать короткопериодическую поправку к большой полуоси.
+
+        :return: Массив значений t и массив векторов состояния, как у propagate (можно передать в add_results).
+        """
+        mu, J2, R = self.rhs_params
+        elements = np.array([self.a, self.e, self.i, self.w, self.omega, self.nu])
+        return t, mean_elements_states(elements, t, mu, J2, R, t0=self.t0, short_period=short_period)
+
     def theoretical_calculations_of_orbit_change(self):
         """
         Эта функция выполняет теоретические расчеты изменения орбиты космического объекта, учитывая влияние
@@ -1,9 +1,13 @@
 import math
+import os
+import sys
 import numpy as np
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import ResultCache, TrajectoryWriter, cached_chunks, output_points_count, stream
 from classes import Orbit
-from rkk4 import runge_kutta_4
 from grafics import start_plot
 from text_result import write_result
 
@@ -21,17 +25,54 @@ mu = 3.986004418 * 10 ** 14  # Гравитационный параметр
 start_datetime = datetime(2023, 11, 14, 19, 00)  # Заданные дата и время начала моделирования
 orbit = Orbit(a=a, e=e, i=i, omega=omega, w=w, nu=nu, mu=mu, start_datetime=start_datetime)
 
-# Вызов метода Рунге-Кутта 4-го порядка
 T = 2 * np.pi * a ** 1.5 / mu ** 0.5  # Период обращения
 end_datetime = datetime(2023, 11, 28, 22, 00)  # Заданные дата и время конца моделирования
 h = 0.2  # Шаг интегрирования по времени
 n = math.ceil((end_datetime - start_datetime).total_seconds() / h)  # Количество шагов
 n = 2 * math.ceil(T / h)
+# Метод интегрирования: "rk4" - Рунге-Кутта 4-го порядка (цикл по шагам скомпилирован), "dopri45" - с
+# автоматическим выбором шага (на порядки меньше шагов при сравнимом дрейфе энергии, h - начальный шаг)
+method = "rk4"
+options = dict(rtol=1e-12) if method == "dopri45" else {}
+# Шаг выдачи результатов не зависит от шага интегрирования: для графиков и таблиц достаточно
+# нескольких тысяч точек на виток, элементы орбиты и интеграл энергии считаются только в них
+dt_out = 2.0
+
+# Режим расчёта: "full" - вся траектория одним куском в памяти, строятся графики и таблицы;
+# "streaming" - для длинных интервалов: в памяти только кусок траектории, в файл пишутся только таблицы по виткам;
+# "analytic" - быстрая оценка по средним элементам с вековыми скоростями J2 без интегрирования, графики и таблицы
+# строятся как в "full"
+# (прохождения перицентра находит orbit.events по ходу расчёта во всех режимах)
+mode = "full"
+chunk_size = None if mode == "full" else 100000  # Количество шагов в куске (None - весь интервал одним куском)
+
+# Траектория сохраняется на диск, если задана папка (потом её можно открыть в replot_stored.py без интегрирования)
+store_path = None  # например, "result/other/trajectory"
+sinks = [orbit.events]
+if mode in ("full", "analytic"):
+    sinks.append(orbit.add_results)
+elif mode != "streaming":
+    raise ValueError(f"Неизвестный режим расчёта: {mode}")
+if store_path is not None:
+    sinks.append(TrajectoryWriter(store_path, n_points=output_points_count(h, n, dt_out=dt_out, method=method), mu=mu,
+                                  a=a, e=e, i=i, w=w, omega=omega, nu=nu, start_datetime=start_datetime, h=h, n=n,
+                                  method=method, dt_out=dt_out))
 
-runge_kutta_4(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=n, orbit=orbit)
+if mode == "analytic":
+    # Те же моменты выдачи, что и при интегрировании: через dt_out и конец интервала
+    stream([orbit.propagate_mean_elements(np.append(np.arange(0, n * h, dt_out), n * h))], *sinks)
+else:
+    # Если такой сценарий уже считался, траектория берётся из кэша на диске без интегрирования ("dopri45" не кэшируется)
+    cache = ResultCache()
+    stream(cached_chunks(cache, model="2_B.Orbit", f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0,
+                         h=h, n=n, chunk_size=chunk_size, method=method, kernel=orbit.rhs_kernel,
+                         params=orbit.rhs_params, dt_out=dt_out,
+                         metadata=dict(mu=mu, a=a, e=e, i=i, w=w, omega=omega, nu=nu, start_datetime=start_datetime,
+                                       h=h, n=n, method=method, dt_out=dt_out), **options), *sinks)
 
 # строим графики
-start_plot(orbit=orbit, where_save="other")
+if mode != "streaming":
+    start_plot(orbit=orbit, where_save="other")
 
 # покажим различия с теорет моделью
 write_result(orbit=orbit, where_save="other/")
@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import StoredTrajectory
+from classes import Orbit
+from grafics import start_plot
+from text_result import write_result
+
+# Траектория, сохранённая main-скриптом (store_path), открывается без повторного интегрирования
+store_path = sys.argv[1] if len(sys.argv) > 1 else "result/other/trajectory"
+where_save = "other"
+
+trajectory = StoredTrajectory(store_path)
+metadata = trajectory.metadata
+orbit = Orbit(a=metadata["a"], e=metadata["e"], i=metadata["i"], omega=metadata["omega"], w=metadata["w"],
+              nu=metadata["nu"], mu=metadata["mu"], start_datetime=metadata["start_datetime"])
+# Траектория отображена в память, поэтому события ищутся по ней одним куском
+orbit.events(trajectory.t, trajectory.y)
+orbit.add_stored_results(trajectory)
+
+# строим графики
+start_plot(orbit=orbit, where_save=where_save)
+
+# покажим различия с теорет моделью
+write_result(orbit=orbit, where_save=f"{where_save}/")
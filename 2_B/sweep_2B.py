@@ -0,0 +1,66 @@
+import math
+import os
+import sys
+import numpy as np
+from datetime import datetime
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import grid, propagate_chunks, run_sweep, stream
+from classes import Orbit
+
+omega = 0.7  # Долгота восходящего узла
+w = 1.37  # Аргумент перицентра
+nu = 0.0  # Истиная аномалия
+mu = 3.986004418 * 10 ** 14  # Гравитационный параметр
+start_datetime = datetime(2023, 11, 14, 19, 00)  # Заданные дата и время начала моделирования
+h = 1  # Шаг интегрирования по времени
+revolutions = 5  # Количество витков
+
+
+def orbit_worker(config: dict) -> dict:
+    """
+    Моделирует одну орбиту с параметрами (a, e, i) из config и возвращает итоговые метрики:
+    дрейф энергии и вековые изменения ДВУ и аргумента перицентра за виток (численно и теоретически).
+    """
+    orbit = Orbit(a=config["a"], e=config["e"], i=config["i"], omega=omega, w=w, nu=nu, mu=mu,
+                  start_datetime=start_datetime)
+    T = 2 * np.pi * orbit.a ** 1.5 / mu ** 0.5  # Период обращения
+    n = math.ceil(revolutions * T / h)
+    stream(propagate_chunks(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=n, chunk_size=n,
+                            kernel=orbit.rhs_kernel, params=orbit.rhs_params), orbit.events, orbit.add_results)
+
+    # Начала витков - прохождения перицентра, найденные во время интегрирования (как в write_result)
+    _, states = orbit.events.get("periapsis")
+    elements = orbit.from_xyz_to_elements_batch(states)
+    count = len(states) - 1
+    result_omega = np.unwrap(elements[:, 4])
+    result_w = np.unwrap(elements[:, 3])
+    th_delta_omega, th_delta_w = orbit.theoretical_calculations_of_orbit_change()
+
+    return {
+        "dE": (np.max(orbit.result_E) - np.min(orbit.result_E)) / abs(orbit.result_E[0]),
+        "delta_omega": (result_omega[-1] - result_omega[0]) / count,
+        "delta_w": (result_w[-1] - result_w[0]) / count,
+        "th_delta_omega": th_delta_omega,
+        "th_delta_w": th_delta_w,
+    }
+
+
+if __name__ == '__main__':
+    # Сетка сценариев: большая полуось, эксцентриситет, наклонение
+    configs = grid(a=[7000 * 1000, 8059 * 1000, 10000 * 1000], e=[0.01, 0.15], i=[0.3, 1.2, 2.0])
+    rows = run_sweep(orbit_worker, configs)
+
+    table = PrettyTable()
+    table.field_names = ["a", "e", "i", "Дрейф E (отн.)", "ДВУ за виток", "ДВУ теор.",
+                         "Арг. перицентра за виток", "Арг. перицентра теор."]
+    for row in rows:
+        table.add_row([row["a"], row["e"], row["i"], f"{row['dE']:.3e}", f"{row['delta_omega']:.6e}",
+                       f"{row['th_delta_omega']:.6e}", f"{row['delta_w']:.6e}", f"{row['th_delta_w']:.6e}"])
+
+    with open("result/sweep_output.txt", "w") as file:
+        file.write(f"Изменение параметров за виток ({revolutions} витков, шаг {h} с):\n")
+        file.write(str(table))
+    print(table)
@@ -5,27 +5,48 @@ from classes import Orbit
 
 
 def write_result(orbit: Orbit, where_save: str):
-    # Находим индексы, где значение становится меньше предыдущего
-    end_of_circle_indices = np.where(orbit.result_nu < np.roll(orbit.result_nu, 1))[0]
+    # Границы витков - прохождения перицентра, найденные во время интегрирования
+    _, states = orbit.events.get("periapsis")
+    write_tables(orbit=orbit, rows=revolution_rows(orbit=orbit, states=states), where_save=where_save)
 
+
+def revolution_rows(orbit: Orbit, states: np.ndarray) -> list:
+    """
+    Строки таблицы (ДВУ, аргумент перицентра, большая полуось, эксцентриситет, наклонение, истинная аномалия)
+    по векторам состояния в начале каждого витка.
+    """
+    a, e, i, w, omega, nu = orbit.from_xyz_to_elements_batch(states).T
+    nu = wrap_true_anomaly(nu)
+    return [[omega[k], w[k], a[k], e[k], i[k], nu[k]] for k in range(len(states))]
+
+
+def wrap_true_anomaly(nu: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+    """
+    Приводит истинную аномалию к [0, 2π). В перицентре она равна нулю, но из-за округления получается
+    чуть меньше 2π; значения, отличающиеся от 2π меньше чем на tolerance (точность момента события), считаются нулём.
+    """
+    nu = np.mod(nu, 2 * np.pi)
+    return np.where(2 * np.pi - nu < tolerance, 0.0, nu)
+
+
+def write_tables(orbit: Orbit, rows: list, where_save: str):
+    """
+    Записывает таблицы изменения параметров орбиты по строкам (ДВУ, аргумент перицентра, большая полуось,
+    эксцентриситет, наклонение, истинная аномалия) в начале каждого витка.
+    """
     # Создание первой таблицы
     table1 = PrettyTable()
     table1.field_names = ["Номер витка", "ДВУ", "Аргумент перицентра", "Большая полуось", "Эксцентриситет",
                           "Наклонение", "Истинная аномалия"]
     count = 0  # счетчик
-    for i in end_of_circle_indices:
+    for row in rows:
         count += 1
-        table1.add_row([count, orbit.result_omega[i],  orbit.result_w[i], orbit.result_a[i], orbit.result_e[i],
-                        orbit.result_i[i], orbit.result_nu[i]])
+        table1.add_row([count] + list(row))
 
     # Создание второй таблицы
     table2 = PrettyTable()
     table2.field_names = ["ДВУ", "Аргумент перицентра", "Большая полуось", "Эксцентриситет", "Наклонение"]
-    table2.add_row([orbit.result_omega[end_of_circle_indices[-1]] - orbit.result_omega[end_of_circle_indices[0]],
-                    orbit.result_w[end_of_circle_indices[-1]] - orbit.result_w[end_of_circle_indices[0]],
-                    orbit.result_a[end_of_circle_indices[-1]] - orbit.result_a[end_of_circle_indices[0]],
-                    orbit.result_e[end_of_circle_indices[-1]] - orbit.result_e[end_of_circle_indices[0]],
-                    orbit.result_i[end_of_circle_indices[-1]] - orbit.result_i[end_of_circle_indices[0]] ])
+    table2.add_row([rows[-1][k] - rows[0][k] for k in range(5)])
 
     # Создание третий таблицы
     th_delta_omega, th_delta_w = (count - 1) * np.array(orbit.theoretical_calculations_of_orbit_change())
@@ -41,5 +62,3 @@ def write_result(orbit: Orbit, where_save: str):
         file.write(str(table3))
         file.write("\n\n\n\nПараметры орбиты в начале каждого витка:\n")
         file.write(str(table1))
-
-
@@ -3,20 +3,31 @@
 #include <GeographicLib/GravityModel.hpp>
 
 
-// Функция для освобождения памяти, выделенной под массив
+// Функция для создания модели гравитации (файл коэффициентов читается с диска один раз)
 extern "C" {
-void freeArrayMemory(double *array) {
-    delete[] array;
+void* createGravityModel(const char *model, const char *path, int N_harmonics) {
+    try {
+        return new GeographicLib::GravityModel(model, path, N_harmonics, N_harmonics);
+    } catch (const std::exception &error) {
+        std::cerr << "GravityModel: " << error.what() << "\n";
+        return nullptr;
+    }
 }
 }
 
 
-// Функция для вычисления вектора гравитационного ускорения в инерциальной системе отсчета (ITRF)
+// Функция для освобождения модели гравитации
 extern "C" {
-double* gravityVector_ITRF(const double* inputArray, double t_jd, int N_harmonics, char *model) {
-    // Выделяем память под результат
-    double *resultArray = new double[3];
+void destroyGravityModel(void *handle) {
+    delete static_cast<GeographicLib::GravityModel *>(handle);
+}
+}
 
+
+// Функция для вычисления вектора гравитационного ускорения в инерциальной системе отсчета (ITRF)
+// для одной точки. Результат записывается в resultArray, потенциал возвращается
+static double gravityVector_ITRF(const GeographicLib::GravityModel &gravity, const double* inputArray, double t_jd,
+                                 double *resultArray) {
     // Вычисляем количество дней с момента J2000
     const double DJ00 = 2451545.0;
     double t_jd_from_J2000 = (t_jd - DJ00);
@@ -31,21 +42,32 @@ double* gravityVector_ITRF(const double* inputArray, double t_jd, int N_harmonic
     double y_GCRF = inputArray[0] * -SIN + inputArray[1] * COS;
     double z_GCRF = inputArray[2];
 
-    // Инициализируем объект GravityModel с использованием модели egm2008 и пути к данным гравитационной модели
-    GeographicLib::GravityModel gravity(model, "/opt/homebrew/Cellar/geographiclib/gravity", N_harmonics, N_harmonics);
-
     // Рассчитываем вектор гравитационного ускорения в GCRF
     double gx_GCRF, gy_GCRF, gz_GCRF;
-    gravity.V(x_GCRF, y_GCRF, z_GCRF, gx_GCRF, gy_GCRF, gz_GCRF);
+    double potential = gravity.V(x_GCRF, y_GCRF, z_GCRF, gx_GCRF, gy_GCRF, gz_GCRF);
 
     // Переводим результат обратно в ITRF
     resultArray[0] = gx_GCRF * COS - gy_GCRF * SIN;
     resultArray[1] = gx_GCRF * SIN + gy_GCRF * COS;
     resultArray[2] = gz_GCRF;
 
-    // Выводим в консоль полученный вектор гравитационного ускорения
-    //std::cout << "Gravity вектор: (" << resultArray[0] << ", " << resultArray[1] << ", " << resultArray[2] << ")\n";
+    return potential;
+}
+
 
-    return resultArray;
+// Функция для вычисления векторов гравитационного ускорения для n точек за один вызов.
+// inputArray и resultArray - массивы n x 3 (по строкам), t_jd - n юлианских дат.
+// potentialArray может быть nullptr, иначе в него записываются n значений потенциала
+extern "C" {
+void gravityVectorsModel_ITRF(void *handle, const double* inputArray, const double* t_jd, int n,
+                              double *resultArray, double *potentialArray) {
+    const GeographicLib::GravityModel &gravity = *static_cast<GeographicLib::GravityModel *>(handle);
+
+    for (int k = 0; k < n; ++k) {
+        double potential = gravityVector_ITRF(gravity, inputArray + 3 * k, t_jd[k], resultArray + 3 * k);
+        if (potentialArray != nullptr) {
+            potentialArray[k] = potential;
+        }
+    }
+}
 }
-}
\ No newline at end of file
@@ -1,68 +1,51 @@
 #include <iostream>
 #include <cmath>
-#include <string>
-#include <GeographicLib/GravityModel.hpp>
-
-// Функция для освобождения памяти, выделенной под массив
-void freeArrayMemory(double* array) {
-    delete[] array;
-}
-
-// Функция для вычисления вектора гравитационного ускорения в инерциальной системе отсчета (ITRF)
-double* gravityVector_ITRF(const double* inputArray, double t_jd, int N_harmonics, std::string model) {
-    // Выделяем память под результат
-    double* resultArray = new double[3];
-
-    // Вычисляем количество дней с момента J2000
-    const double DJ00 = 2451545.0;
-    double t_jd_from_J2000 = (t_jd - DJ00);
-
-    // Выводим значение величины t_jd_from_J2000 в консоль
-    std::cout << "Days from J2000: " << t_jd_from_J2000 << "\n";
-
-    // Вычисляем угол theta
-    double theta = 2 * M_PI * (0.7790572732640 + 1.00273781191135448 * t_jd_from_J2000);
-    double COS = cos(theta);
-    double SIN = sin(theta);
-
-    // Переводим координаты из ITRF в GCRF
-    double x_GCRF = inputArray[0] * COS + inputArray[1] * SIN;
-    double y_GCRF = inputArray[0] * -SIN + inputArray[1] * COS;
-    double z_GCRF = inputArray[2];
-
-    // Инициализируем объект GravityModel с использованием модели egm2008 и пути к данным гравитационной модели
-    GeographicLib::GravityModel gravity(model, "/opt/homebrew/Cellar/geographiclib/gravity", N_harmonics, N_harmonics);
-
-    // Рассчитываем вектор гравитационного ускорения в GCRF
-    double gx_GCRF, gy_GCRF, gz_GCRF;
-    gravity.V(x_GCRF, y_GCRF, z_GCRF, gx_GCRF, gy_GCRF, gz_GCRF);
-
-    // Переводим результат обратно в ITRF
-    resultArray[0] = gx_GCRF * COS - gy_GCRF * SIN;
-    resultArray[1] = gx_GCRF * SIN + gy_GCRF * COS;
-    resultArray[2] = gz_GCRF;
-
-    // Выводим в консоль полученный вектор гравитационного ускорения
-    std::cout << "Gravity вектор: (" << resultArray[0] << ", " << resultArray[1] << ", " << resultArray[2] << ")\n";
-
-    return resultArray;
+#include <vector>
+
+// Функции библиотеки gravity_ITRF (gravity_ITRF.cpp)
+extern "C" {
+void* createGravityModel(const char *model, const char *path, int N_harmonics);
+void destroyGravityModel(void *handle);
+void gravityVectorsModel_ITRF(void *handle, const double* inputArray, const double* t_jd, int n,
+                              double *resultArray, double *potentialArray);
 }
 
-// Основная функция программы
-int main() {
-    // Пример использования функции gravityVector_ITRF
-    double x_ITRF = 6371.302e3;
-    double y_ITRF = 0;
-    double z_ITRF = 0;
-    double t_jd = 2460000.0;
+// Проверка собранной библиотеки: векторы ускорения для n точек считаются по одной точке за вызов
+// и одним вызовом для всех точек, результаты должны совпасть (скорость через ctypes - benchmark_gravity.py)
+int main(int argc, char *argv[]) {
+    const char *model = "egm2008";
+    const char *path = argc > 1 ? argv[1] : "/opt/homebrew/Cellar/geographiclib/gravity";
     int N_harmonics = 10;
-    std::string model = "egm2008";
-
-    // Создаем массив входных данных
-    double Array[3] = {x_ITRF, y_ITRF, z_ITRF};
-
-    // Вызываем функцию для расчета вектора гравитационного ускорения в ITRF
-    gravityVector_ITRF(Array, t_jd, N_harmonics, model);
-
-    return 0;
-}
\ No newline at end of file
+    int n = 100000;
+
+    void *handle = createGravityModel(model, path, N_harmonics);
+    if (handle == nullptr) {
+        std::cerr << "Не удалось загрузить модель " << model << " из " << path << "\n";
+        return 1;
+    }
+
+    // Точки на круговой орбите радиусом 8059 км, по одной через 0.2 с
+    std::vector<double> xyz(3 * n), t_jd(n), single(3 * n), batch(3 * n), potential(n);
+    for (int k = 0; k < n; ++k) {
+        double angle = 2 * M_PI * k / n;
+        xyz[3 * k] = 8059e3 * cos(angle);
+        xyz[3 * k + 1] = 8059e3 * sin(angle) * cos(1.2);
+        xyz[3 * k + 2] = 8059e3 * sin(angle) * sin(1.2);
+        t_jd[k] = 2460263.29167 + 0.2 * k / 86400;
+    }
+
+    for (int k = 0; k < n; ++k) {
+        gravityVectorsModel_ITRF(handle, &xyz[3 * k], &t_jd[k], 1, &single[3 * k], nullptr);
+    }
+    gravityVectorsModel_ITRF(handle, xyz.data(), t_jd.data(), n, batch.data(), potential.data());
+
+    double max_difference = 0;
+    for (int k = 0; k < 3 * n; ++k) {
+        max_difference = std::fmax(max_difference, std::fabs(single[k] - batch[k]));
+    }
+    std::cout << "Точек: " << n << "\n";
+    std::cout << "Максимальная разница ускорений: " << max_difference << "\n";
+
+    destroyGravityModel(handle);
+    return max_difference == 0 ? 0 : 1;
+}
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import numpy as np
+from datetime import datetime
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from classes import Gravity, HarmonicGravity
+
+
+start_datetime = datetime(2023, 11, 14, 19, 00)  # Заданные дата и время начала моделирования
+N_harmonics = 10  # Степень и порядок разложения гравитационного поля
+n = 20000  # Количество точек
+
+# Точки на круговой орбите радиусом 8059 км, по одной через 0.2 с (как в Gravity/main.cpp)
+angle = 2 * np.pi * np.arange(n) / n
+xyz = 8059e3 * np.column_stack((np.cos(angle), np.sin(angle) * np.cos(1.2), np.sin(angle) * np.sin(1.2)))
+t = 0.2 * np.arange(n)
+
+# Библиотека 'native' должна быть пересобрана из текущего gravity_ITRF.cpp, иначе её строка пропускается
+backends = [("numpy", lambda: HarmonicGravity(start_datetime=start_datetime, N_harmonics=N_harmonics)),
+            ("native", lambda: Gravity(start_datetime=start_datetime, N_harmonics=N_harmonics))]
+
+table = PrettyTable()
+table.field_names = ["Модель", "По одной точке, с", "Одним вызовом, с", "Ускорение", "Макс. разница, м/с^2"]
+for name, create in backends:
+    try:
+        gravity = create()
+    except RuntimeError as error:
+        print(f"{name}: {error}")
+        continue
+
+    start_time = time.time()
+    single = np.array([gravity.get_vector(xyz[k], t[k])[3:6] for k in range(n)])
+    single_time = time.time() - start_time
+
+    start_time = time.time()
+    batch = gravity.get_vectors(xyz, t)
+    batch_time = time.time() - start_time
+
+    table.add_row([name, round(single_time, 3), round(batch_time, 4), f"{single_time / batch_time:.0f}x",
+                   f"{np.max(np.abs(single - batch)):.3e}"])
+
+print(table)
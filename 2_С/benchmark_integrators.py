@@ -0,0 +1,60 @@
+import math
+import os
+import sys
+import time
+import numpy as np
+from datetime import datetime
+from prettytable import PrettyTable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import propagate
+from classes import Orbit
+
+
+a = 8059 * 1000  # Большая полуось
+e = 0.15  # Эксцентриситет
+i = 1.2  # Наклонение
+omega = 0.7  # Долгота восходящего узла
+w = 1.37  # Аргумент перицентра
+nu = 0.0  # Истиная аномалия
+mu = 3.986004418 * 10 ** 14  # Гравитационный параметр
+start_datetime = datetime(2023, 11, 14, 19, 00)  # Заданные дата и время начала моделирования
+# 'numpy' не требует собранной библиотеки GeographicLib, 'native' - быстрее
+gravity_backend = 'numpy'
+
+T = 2 * np.pi * a ** 1.5 / mu ** 0.5  # Период обращения
+revolutions = 1  # Количество витков
+# Интервал кратен всем шагам, чтобы все методы заканчивали расчёт в один и тот же момент
+span = 60 * math.ceil(revolutions * T / 60)
+
+# Поле вращается вместе с Землёй, поэтому интеграл энергии в инерциальной системе не сохраняется
+# и точность оценивается по отклонению конечного положения от эталонного решения
+orbit = Orbit(a=a, e=e, i=i, omega=omega, w=w, nu=nu, mu=mu, start_datetime=start_datetime,
+              gravity_backend=gravity_backend)
+h_reference = 1
+_, y_reference = propagate(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h_reference,
+                           n=round(span / h_reference), method="dopri45", rtol=1e-13, atol=1e-10)
+
+# Методы и шаги интегрирования, которые сравниваем
+cases = [
+    ("rk4", [1, 5, 10]),
+    ("dopri45", [10]),
+    ("verlet", [1]),
+    ("yoshida4", [5, 10]),
+    ("stormer_cowell", [10, 20, 30]),
+]
+
+table = PrettyTable()
+table.field_names = ["Метод", "Шаг, с", "Шагов", "Время, с", "Ошибка положения, м"]
+for method, steps in cases:
+    for h in steps:
+        start_time = time.time()
+        t, y = propagate(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=round(span / h),
+                         method=method)
+        execution_time = time.time() - start_time
+
+        table.add_row([method, h, len(t) - 1, round(execution_time, 3),
+                       f"{np.linalg.norm(y[-1, 0:3] - y_reference[-1, 0:3]):.3e}"])
+
+print(table)
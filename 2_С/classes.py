@@ -1,50 +1,118 @@
 import numpy as np
 import ctypes
 import os
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
 import ephem
 
+from harmonics import HarmonicGravity
+from propagation.dense import Trajectory
+from propagation.elements import xyz_to_elements
+from propagation.events import EventDetector
 
-class Gravity:
-    def __init__(self, start_datetime: datetime, N_harmonics: int = 10, model: str = 'egm2008'):
 
-        lib = ctypes.CDLL(f"{os.path.dirname(os.path.abspath(__file__))}/Gravity/build/libgravity_ITRF.dylib")
+# Библиотека собирается из Gravity/gravity_ITRF.cpp (нужна GeographicLib) после каждого изменения исходника:
+#   cd Gravity && mkdir -p build && cd build && cmake .. && make
+# На macOS получается libgravity_ITRF.dylib, на Linux - libgravity_ITRF.so
+GRAVITY_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Gravity', 'build',
+                               'libgravity_ITRF.dylib' if sys.platform == 'darwin' else 'libgravity_ITRF.so')
+GRAVITY_FUNCTIONS = ('createGravityModel', 'destroyGravityModel', 'gravityVectorsModel_ITRF')
+GRAVITY_REBUILD_HINT = ("Пересоберите библиотеку: cd 2_С/Gravity && mkdir -p build && cd build && cmake .. && make "
+                        "(нужна GeographicLib) или используйте gravity_backend='numpy'")
+
 
-        # Определение типа аргумента и возвращаемого значения функции
-        lib.gravityVector_ITRF.argtypes = [ctypes.POINTER(ctypes.c_double), ctypes.c_double,
-                                           ctypes.c_int, ctypes.c_char_p]
-        lib.gravityVector_ITRF.restype = ctypes.POINTER(ctypes.c_double)
+class Gravity:
+    handle = None
+
+    def __init__(self, start_datetime: datetime, N_harmonics: int = 10, model: str = 'egm2008',
+                 data_path: str = '/opt/homebrew/Cellar/geographiclib/gravity'):
+        """
+        Загружает библиотеку и один раз создаёт модель гравитации, которая используется при каждом вызове.
 
-        # Определение типа аргумента функции освобождения памяти
-        lib.freeArrayMemory.argtypes = [ctypes.POINTER(ctypes.c_double)]
+            :param start_datetime: Дата и время начальных параметров.
+            :param N_harmonics: Степень и порядок разложения гравитационного поля.
+            :param model: Название модели гравитации GeographicLib.
+            :param data_path: Каталог с файлами моделей гравитации GeographicLib.
+        """
+        try:
+            lib = ctypes.CDLL(GRAVITY_LIBRARY)
+        except OSError as error:
+            raise RuntimeError(f"Не удалось загрузить библиотеку {GRAVITY_LIBRARY}: {error}. {GRAVITY_REBUILD_HINT}") \
+                from error
+        # Библиотека, собранная из старой версии gravity_ITRF.cpp, загружается, но нужных функций в ней нет
+        missing = [name for name in GRAVITY_FUNCTIONS if not hasattr(lib, name)]
+        if missing:
+            raise RuntimeError(f"В библиотеке {GRAVITY_LIBRARY} нет функций {', '.join(missing)} - она собрана "
+                               f"из старой версии gravity_ITRF.cpp. {GRAVITY_REBUILD_HINT}")
+
+        # Определение типа аргумента и возвращаемого значения функций работы с моделью
+        double_ptr = ctypes.POINTER(ctypes.c_double)
+        lib.createGravityModel.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        lib.createGravityModel.restype = ctypes.c_void_p
+        lib.destroyGravityModel.argtypes = [ctypes.c_void_p]
+        lib.gravityVectorsModel_ITRF.argtypes = [ctypes.c_void_p, double_ptr, double_ptr, ctypes.c_int,
+                                                 double_ptr, double_ptr]
+        lib.gravityVectorsModel_ITRF.restype = None
 
         self.lib = lib
         self.N_harmonics = N_harmonics
         self.model = model
+        self.data_path = data_path
         self.start_datetime = start_datetime
+        # Юлианская дата начала моделирования, от неё отсчитываются все t
+        self.start_jd = ephem.julian_date(start_datetime)
 
-    def get_vector(self, xyz_ITRF_np: np.ndarray, t: float):
-        # Текущее время шага
-        current_datetime = self.start_datetime + timedelta(seconds=t)
-        # Преобразование в юлианские дни
-        current_datetime_jd = ephem.julian_date(current_datetime)
+        # Файл коэффициентов читается с диска только здесь
+        self.handle = lib.createGravityModel(model.encode('utf-8'), data_path.encode('utf-8'), N_harmonics)
+        if not self.handle:
+            raise RuntimeError(f"Не удалось загрузить модель гравитации {model} из {data_path}")
+
+    def __del__(self):
+        if self.handle:
+            self.lib.destroyGravityModel(self.handle)
+            self.handle = None
+
+    def description(self) -> dict:
+        """
+        Настройки модели поля, от которых зависит траектория (для ключа кэша результатов).
+        """
+        return {"backend": "native", "model": self.model, "data_path": self.data_path,
+                "N_harmonics": self.N_harmonics}
 
-        # Получение указателя на данные массива NumPy
-        xyz_ITRF_ptr = xyz_ITRF_np.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+    def get_vectors(self, xyz_ITRF_np: np.ndarray, t, out: np.ndarray = None, potential: np.ndarray = None):
+        """
+        Рассчитывает векторы гравитационного ускорения для N точек за один вызов библиотеки.
 
-        # Вызов функции из библиотеки
-        result_ptr = self.lib.gravityVector_ITRF(
-            xyz_ITRF_ptr, current_datetime_jd, self.N_harmonics, self.model.encode('utf-8'))
+            :param xyz_ITRF_np: NumPy массив (N, 3) с координатами точек.
+            :param t: Время (секунды) от start_datetime: число или NumPy массив (N,).
+            :param out: Массив (N, 3) для записи результата. Если не задан, создаётся новый.
+            :param potential: Массив (N,) для записи гравитационного потенциала. Если не задан, не считается.
 
-        # Преобразование указателя на результат в массив NumPy
-        result_np = np.ctypeslib.as_array(result_ptr, shape=(3,))
+        :return: NumPy массив (N, 3) с векторами гравитационного ускорения.
+        """
+        xyz_ITRF_np = np.ascontiguousarray(xyz_ITRF_np, dtype=np.float64).reshape(-1, 3)
+        n = len(xyz_ITRF_np)
 
-        right_parts = np.zeros(6)
-        right_parts[3:6] = result_np
+        # Переводим время в юлианские дни
+        t_jd = np.ascontiguousarray(np.broadcast_to(self.start_jd + np.asarray(t, dtype=np.float64) / 86400, (n,)))
 
-        # Освобождение памяти, выделенной под массив
-        self.lib.freeArrayMemory(result_ptr)
+        if out is None:
+            out = np.empty((n, 3))
+        if not out.flags.c_contiguous or out.shape != (n, 3):
+            raise ValueError("out должен быть непрерывным массивом (N, 3)")
+        if potential is not None and (not potential.flags.c_contiguous or potential.shape != (n,)):
+            raise ValueError("potential должен быть непрерывным массивом (N,)")
 
+        double_ptr = ctypes.POINTER(ctypes.c_double)
+        self.lib.gravityVectorsModel_ITRF(self.handle, xyz_ITRF_np.ctypes.data_as(double_ptr),
+                                          t_jd.ctypes.data_as(double_ptr), n, out.ctypes.data_as(double_ptr),
+                                          None if potential is None else potential.ctypes.data_as(double_ptr))
+        return out
+
+    def get_vector(self, xyz_ITRF_np: np.ndarray, t: float):
+        # Ускорение записывается библиотекой сразу в правые части
+        right_parts = np.zeros(6)
+        self.get_vectors(xyz_ITRF_np, t, out=right_parts[3:6].reshape(1, 3))
         return right_parts
 
 
@@ -54,9 +122,13 @@ class Orbit:
     result_t = None
     result_x = result_y = result_z = result_dotx = result_doty = result_dotz = None
     result_a = result_e = result_i = result_w = result_omega = result_nu = None
+    result_E = result_dg = None
+    trajectory = None  # Плотная выдача: состояние в любой момент времени (trajectory.at)
+    events = None  # Приёмник для propagate/stream: моменты и состояния в перицентре и восходящем узле (events.get)
 
     def __init__(self, a: float, e: float, i: float, w: float, omega: float, nu: float,
-                 mu: float, start_datetime: datetime):
+                 mu: float, start_datetime: datetime, gravity_backend: str = 'native', N_harmonics: int = 10,
+                 coefficients_path: str = None):
         """
         Конструктор класса, который инициализирует объект орбиты с заданными параметрами.
 
@@ -68,6 +140,11 @@ class Orbit:
             :param nu: Истиная аномалия.
             :param mu: Гравитационный параметр.
             :param start_datetime: Дата и время начальных параметров.
+            :param gravity_backend: Модель сложного поля: 'native' (GeographicLib через ctypes)
+                                    или 'numpy' (HarmonicGravity, не требует библиотеки).
+            :param N_harmonics: Степень и порядок разложения гравитационного поля.
+            :param coefficients_path: Для 'numpy' - файл коэффициентов, для 'native' - каталог моделей GeographicLib
+                                      (None - значение по умолчанию модели поля).
 
         """
         self.a = a  # Большая полуось
@@ -77,10 +154,20 @@ class Orbit:
         self.omega = omega  # Долгота восходящего узла
         self.nu = nu  # Истиная аномалия
         self.mu = mu  # Гравитационный параметр
-        self.gravity = Gravity(start_datetime=start_datetime)  # Класс Гравитация для модели сложного поля
+        # Класс Гравитация для модели сложного поля
+        if gravity_backend == 'native':
+            options = {} if coefficients_path is None else {"data_path": coefficients_path}
+            self.gravity = Gravity(start_datetime=start_datetime, N_harmonics=N_harmonics, **options)
+        elif gravity_backend == 'numpy':
+            options = {} if coefficients_path is None else {"coefficients_path": coefficients_path}
+            self.gravity = HarmonicGravity(start_datetime=start_datetime, N_harmonics=N_harmonics, **options)
+        else:
+            raise ValueError(f"Неизвестная модель гравитации: {gravity_backend}")
 
         # добавляем начальные данные
         self.y0 = self.from_elements_to_xyz(a=a, e=e, i=i, w=w, omega=omega, nu=nu)
+        # события ищутся по ходу интегрирования: events передаётся в stream вместе с остальными приёмниками
+        self.events = EventDetector(f=self.vector_function_right_parts)
 
     def vector_function_right_parts(self, t: float, y: np.ndarray):
         """
@@ -95,6 +182,20 @@ class Orbit:
         right_parts[0:3] = y[3:6]
         return right_parts
 
+    def vector_function_right_parts_batch(self, t: float, y: np.ndarray):
+        """
+        Рассчитывает правые части сразу для N спутников одним вызовом модели поля (get_vectors).
+
+            :param t: Время (секунды).
+            :param y: NumPy массив (N, 6) с векторами состояния спутников.
+
+        :return: NumPy массив (N, 6) с правыми частями дифференциальных уравнений
+        """
+        right_parts = np.empty_like(y)
+        right_parts[:, 0:3] = y[:, 3:6]
+        right_parts[:, 3:6] = self.gravity.get_vectors(y[:, 0:3], t=t)
+        return right_parts
+
     def from_elements_to_xyz(self, a: float, e: float, i: float, w: float, omega: float, nu: float):
         """
         Рассчитывает вектор состояния в декартовой системе координат по орбитальным элементам.
@@ -181,15 +282,65 @@ class Orbit:
 
         return np.array([a, e, i, w, omega, nu])
 
+    def from_xyz_to_elements_batch(self, xyz_coords: np.ndarray):
+        """
+        Рассчитывает орбитальные элементы сразу для всех векторов состояния (без цикла Python).
+        Совпадает с from_xyz_to_elements для каждой строки с точностью до нескольких ULP (другой порядок операций).
+
+            :param xyz_coords: NumPy массив (N, 6) с векторами состояния в декартовых координатах.
+
+            :return: NumPy массив (N, 6) с орбитальными элементами (a, e, i, w, omega, nu).
+        """
+        return xyz_to_elements(xyz_coords, mu=self.mu)
+
     def add_results(self, t: np.ndarray, y: np.ndarray):
         """
-        Добавляет результаты расчетов.
+        Добавляет результаты расчетов (события находит приёмник events, его нужно передать в stream отдельно).
         """
         self.result_t = t
+        self.trajectory = Trajectory(t, y, f=self.vector_function_right_parts, second_order=True)
 
         # Разделите координаты на компоненты x, y и z и так далее
         self.result_x, self.result_y, self.result_z, self.result_dotx, self.result_doty, self.result_dotz = y.T
 
         # Получим элементы орбиты в каждый момент времени
         self.result_a, self.result_e, self.result_i, self.result_w, self.result_omega, self.result_nu = \
-            np.array(list(map(self.from_xyz_to_elements, y))).T
+            self.from_xyz_to_elements_batch(y).T
+
+        # Cчитаем интеграл энергии и отклонение ускорения от центрального поля
+        self.calculate_first_integral(t=t, y=y)
+
+    def add_stored_results(self, trajectory):
+        """
+        Добавляет результаты расчетов, сохранённые на диск (propagation.store.StoredTrajectory),
+        без повторного интегрирования. Координаты и элементы орбиты остаются отображёнными в память.
+        События находит приёмник events, его нужно передать в stream при расчёте или вызвать по сохранённой траектории.
+        """
+        self.result_t = trajectory.t
+        self.trajectory = Trajectory(trajectory.t, trajectory.y, f=self.vector_function_right_parts, second_order=True)
+        self.result_x, self.result_y, self.result_z, self.result_dotx, self.result_doty, self.result_dotz = \
+            trajectory.y.T
+
+        elements = trajectory.elements
+        if elements is None:
+            elements = self.from_xyz_to_elements_batch(trajectory.y)
+        self.result_a, self.result_e, self.result_i, self.result_w, self.result_omega, self.result_nu = elements.T
+
+        # Cчитаем интеграл энергии и отклонение ускорения от центрального поля
+        self.calculate_first_integral(t=trajectory.t, y=trajectory.y)
+
+    def calculate_first_integral(self, t: np.ndarray, y: np.ndarray):
+        """
+        Рассчитывает интеграл энергии E и модуль отклонения ускорения от центрального поля dg.
+        Ускорения и потенциал для всех моментов времени считаются одним вызовом библиотеки.
+            :param t: NumPy массив моментов времени.
+            :param y: NumPy массив, содержащий вектор состояния в декартовых координатах.
+        """
+        r = y[:, 0:3]
+        v = y[:, 3:6]
+        potential = np.empty(len(y))
+        g = self.gravity.get_vectors(r, t, potential=potential)
+
+        self.result_E = (np.linalg.norm(v, axis=1) ** 2) / 2 - potential
+        g_central = - self.mu * r / np.linalg.norm(r, axis=1)[:, np.newaxis] ** 3
+        self.result_dg = np.linalg.norm(g - g_central, axis=1)
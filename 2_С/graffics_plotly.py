@@ -90,18 +90,20 @@ def static_3d_fig(orbit: Orbit) -> list:
     return [earth_trace_surface, start_point_trace, zero_meridian, plane_trace]
 
 
-def make_list_coords_orbits(orbit: Orbit) -> list:
-    # Находим индексы, где значение становится меньше предыдущего
-    end_of_circle_indices = np.where(orbit.result_nu < np.roll(orbit.result_nu, 1))[0]
+def make_list_coords_orbits(orbit: Orbit, points_per_orbit: int = 500) -> list:
+    # Границы витков - моменты прохождения перицентра, найденные во время интегрирования
+    end_of_circle_times, _ = orbit.events.get("periapsis")
     list_coords_orbits = []
-    for i in range(0, len(end_of_circle_indices), 12):
-        list_coords_orbits.append({"x": orbit.result_x[end_of_circle_indices[i]: end_of_circle_indices[i + 1]],
-                                   "y": orbit.result_y[end_of_circle_indices[i]: end_of_circle_indices[i + 1]],
-                                   "z": orbit.result_z[end_of_circle_indices[i]: end_of_circle_indices[i + 1]],
-                                   "t_start": orbit.gravity.start_datetime + timedelta(
-                                       seconds=orbit.result_t[end_of_circle_indices[i]]),
-                                   "t_end": orbit.gravity.start_datetime + timedelta(
-                                       seconds=orbit.result_t[end_of_circle_indices[i+1]])})
+    for i in range(0, len(end_of_circle_times) - 1, 12):
+        # Точки витка берём из плотной выдачи равномерно по времени, а не все узлы сетки интегрирования
+        t_start = end_of_circle_times[i]
+        t_end = end_of_circle_times[i + 1]
+        x, y, z = orbit.trajectory.at(np.linspace(t_start, t_end, points_per_orbit))[:, 0:3].T
+        list_coords_orbits.append({"x": x,
+                                   "y": y,
+                                   "z": z,
+                                   "t_start": orbit.gravity.start_datetime + timedelta(seconds=t_start),
+                                   "t_end": orbit.gravity.start_datetime + timedelta(seconds=t_end)})
     return list_coords_orbits
 
 
@@ -69,6 +69,12 @@ def save_and_close_plot(figure, filename):
 
 
 def start_plot(orbit: Orbit, where_save: str):
+    # График интеграла энергии и отклонения ускорения от центрального поля
+    fig_E = plt.figure(figsize=(10.5, 7))
+    plot_subplot(211, orbit.result_t, orbit.result_E, 'Интеграл энергии', 't, c', 'E')
+    plot_subplot(212, orbit.result_t, orbit.result_dg, 'Отклонение ускорения от центрального поля', 't, c', '|dg|')
+    save_and_close_plot(fig_E, f'result/{where_save}/result_E.png')
+
     # Графики орбитальных элементов
     fig_elements = plt.figure(figsize=(10.5, 7))
     plot_subplot(321, orbit.result_t, orbit.result_a, 'Большая полуось', 't, c', 'a')
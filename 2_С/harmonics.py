@@ -0,0 +1,238 @@
+import os
+from datetime import datetime
+from functools import lru_cache
+from math import lgamma
+
+import numpy as np
+import ephem
+
+# Модель EGM2008 (до 180 степени) из кода Маштакова
+DEFAULT_COEFFICIENTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'код Маштакова', '+models',
+                                    'field_constants', 'EGM2008_to2190_TideFree_180.txt')
+EGM2008_MU = 3.986004415 * 10 ** 14  # Гравитационный параметр модели EGM2008
+EGM2008_RADIUS = 6378136.3  # Экваториальный радиус модели EGM2008
+
+
+def _to_float(value: str) -> float:
+    # В старых файлах EGM порядок числа записан через D (0.1D-05)
+    return float(value.replace('D', 'E').replace('d', 'e'))
+
+
+@lru_cache(maxsize=None)
+def load_coefficients(path: str, N_harmonics: int) -> tuple:
+    """
+    Загружает нормированные коэффициенты C, S гравитационного поля до степени N_harmonics.
+    Поддерживаются текстовые файлы EGM (строки "n m C S ...") и файлы ICGEM .gfc (строки "gfc n m C S ...").
+
+        :param path: Путь к файлу коэффициентов.
+        :param N_harmonics: Максимальная степень и порядок.
+
+    :return: (C, S, mu, radius), C и S - массивы (N_harmonics + 1, N_harmonics + 1),
+             mu и radius берутся из заголовка ICGEM (None для файлов EGM).
+    """
+    C = np.zeros((N_harmonics + 1, N_harmonics + 1))
+    S = np.zeros((N_harmonics + 1, N_harmonics + 1))
+    mu = radius = None
+
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if not fields:
+                continue
+            # Заголовок ICGEM
+            if fields[0] == 'earth_gravity_constant':
+                mu = _to_float(fields[1])
+                continue
+            if fields[0] == 'radius':
+                radius = _to_float(fields[1])
+                continue
+            if fields[0] in ('gfc', 'gfct'):
+                fields = fields[1:]
+            try:
+                n, m = int(fields[0]), int(fields[1])
+            except (ValueError, IndexError):
+                continue
+            if n <= N_harmonics and m <= n:
+                C[n, m] = _to_float(fields[2])
+                S[n, m] = _to_float(fields[3])
+
+    # Центральное поле в файлах EGM не записано
+    C[0, 0] = 1.0
+    return C, S, mu, radius
+
+
+@lru_cache(maxsize=None)
+def recursion_coefficients(N_harmonics: int) -> dict:
+    """
+    Рассчитывает коэффициенты нормированных рекурсий V_nm, W_nm (функции Кеннингема)
+    и множители для ускорений. Результат кэшируется для каждой степени.
+
+        :param N_harmonics: Максимальная степень и порядок.
+
+    :return: Словарь с массивами коэффициентов.
+    """
+    n_max = N_harmonics + 1  # для ускорений нужны V_nm до степени N_harmonics + 1
+
+    def log_norm(n, m):
+        # Логарифм нормирующего множителя: P_nm(норм.) = N_nm * P_nm
+        return 0.5 * (np.log(2.0 if m > 0 else 1.0) + np.log(2 * n + 1) + lgamma(n - m + 1) - lgamma(n + m + 1))
+
+    # Рекурсия по степени: V_nm = a_nm * z' * V_n-1,m - b_nm * rho^2 * V_n-2,m
+    a = np.zeros((n_max + 1, n_max + 1))
+    b = np.zeros((n_max + 1, n_max + 1))
+    for n in range(1, n_max + 1):
+        for m in range(n):
+            a[n, m] = np.sqrt((2 * n + 1) * (2 * n - 1) / ((n - m) * (n + m)))
+            if n >= 2:
+                b[n, m] = np.sqrt((2 * n + 1) * (n + m - 1) * (n - m - 1) / ((2 * n - 3) * (n + m) * (n - m)))
+
+    # Рекурсия по секториальным функциям: V_mm = c_m * (x' * V_m-1,m-1 - y' * W_m-1,m-1)
+    c = np.zeros(n_max + 1)
+    c[1] = np.sqrt(3.0)
+    for m in range(2, n_max + 1):
+        c[m] = np.sqrt((2 * m + 1) / (2 * m))
+
+    # Множители для ускорений по всем парам (n, m), n <= N_harmonics
+    n_idx, m_idx = np.tril_indices(N_harmonics + 1)
+    f_plus = np.array([np.exp(log_norm(n, m) - log_norm(n + 1, m + 1)) for n, m in zip(n_idx, m_idx)])
+    f_minus = np.array([(n - m + 2) * (n - m + 1) * np.exp(log_norm(n, m) - log_norm(n + 1, m - 1)) if m > 0 else 0.0
+                        for n, m in zip(n_idx, m_idx)])
+    f_z = np.array([(n - m + 1) * np.exp(log_norm(n, m) - log_norm(n + 1, m)) for n, m in zip(n_idx, m_idx)])
+    # Для m = 0 в формулах для x и y нет множителя 1/2
+    f_plus = np.where(m_idx == 0, f_plus, f_plus / 2)
+    f_minus = f_minus / 2
+
+    return {"a": a, "b": b, "c": c, "n": n_idx, "m": m_idx, "f_plus": f_plus, "f_minus": f_minus, "f_z": f_z}
+
+
+class HarmonicGravity:
+    def __init__(self, start_datetime: datetime, N_harmonics: int = 10, coefficients_path: str = DEFAULT_COEFFICIENTS,
+                 mu: float = None, radius: float = None, chunk_size: int = 10000):
+        """
+        Модель сложного гравитационного поля на NumPy, повторяющая интерфейс класса Gravity.
+
+            :param start_datetime: Дата и время начальных параметров.
+            :param N_harmonics: Степень и порядок разложения гравитационного поля.
+            :param coefficients_path: Путь к файлу коэффициентов в формате EGM или ICGEM.
+            :param mu: Гравитационный параметр модели (по умолчанию из файла ICGEM или EGM2008).
+            :param radius: Экваториальный радиус модели (по умолчанию из файла ICGEM или EGM2008).
+            :param chunk_size: Сколько точек обрабатывать за раз (ограничивает память).
+        """
+        C, S, file_mu, file_radius = load_coefficients(coefficients_path, N_harmonics)
+
+        self.N_harmonics = N_harmonics
+        self.coefficients_path = coefficients_path
+        self.start_datetime = start_datetime
+        self.start_jd = ephem.julian_date(start_datetime)
+        self.mu = mu or file_mu or EGM2008_MU
+        self.radius = radius or file_radius or EGM2008_RADIUS
+        self.chunk_size = chunk_size
+
+        self.recursion = recursion_coefficients(N_harmonics)
+        n_idx, m_idx = self.recursion["n"], self.recursion["m"]
+        self.C = C[n_idx, m_idx]
+        self.S = S[n_idx, m_idx]
+
+    def description(self) -> dict:
+        """
+        Настройки модели поля, от которых зависит траектория (для ключа кэша результатов).
+        """
+        return {"backend": "numpy", "coefficients_path": self.coefficients_path, "N_harmonics": self.N_harmonics,
+                "mu": self.mu, "radius": self.radius}
+
+    def cunningham_functions(self, xyz: np.ndarray) -> tuple:
+        """
+        Рассчитывает нормированные функции V_nm, W_nm до степени N_harmonics + 1.
+
+            :param xyz: NumPy массив (N, 3) с координатами точек.
+
+        :return: Массивы V и W размера (N_harmonics + 2, N_harmonics + 2, N).
+        """
+        a, b, c = self.recursion["a"], self.recursion["b"], self.recursion["c"]
+        n_max = self.N_harmonics + 1
+        R = self.radius
+
+        x, y, z = xyz.T
+        r2 = x ** 2 + y ** 2 + z ** 2
+        x_s, y_s, z_s, rho2 = x * R / r2, y * R / r2, z * R / r2, R ** 2 / r2
+
+        V = np.zeros((n_max + 1, n_max + 1, len(xyz)))
+        W = np.zeros((n_max + 1, n_max + 1, len(xyz)))
+        V[0, 0] = R / np.sqrt(r2)
+
+        for n in range(1, n_max + 1):
+            # Секториальные функции
+            V[n, n] = c[n] * (x_s * V[n - 1, n - 1] - y_s * W[n - 1, n - 1])
+            W[n, n] = c[n] * (x_s * W[n - 1, n - 1] + y_s * V[n - 1, n - 1])
+
+            # Остальные порядки m < n сразу для всех m
+            V[n, :n] = a[n, :n, None] * z_s * V[n - 1, :n]
+            W[n, :n] = a[n, :n, None] * z_s * W[n - 1, :n]
+            if n >= 2:
+                V[n, :n] -= b[n, :n, None] * rho2 * V[n - 2, :n]
+                W[n, :n] -= b[n, :n, None] * rho2 * W[n - 2, :n]
+
+        return V, W
+
+    def _accelerations(self, xyz: np.ndarray, out: np.ndarray, potential: np.ndarray = None):
+        n, m = self.recursion["n"], self.recursion["m"]
+        f_plus, f_minus, f_z = self.recursion["f_plus"], self.recursion["f_minus"], self.recursion["f_z"]
+        C, S = self.C[:, None], self.S[:, None]
+
+        V, W = self.cunningham_functions(xyz)
+        V_plus, W_plus = V[n + 1, m + 1], W[n + 1, m + 1]
+        V_minus, W_minus = V[n + 1, np.maximum(m - 1, 0)], W[n + 1, np.maximum(m - 1, 0)]
+        V_z, W_z = V[n + 1, m], W[n + 1, m]
+
+        k = self.mu / self.radius ** 2
+        out[:, 0] = k * (f_plus[:, None] * (-C * V_plus - S * W_plus) +
+                         f_minus[:, None] * (C * V_minus + S * W_minus)).sum(axis=0)
+        out[:, 1] = k * (f_plus[:, None] * (-C * W_plus + S * V_plus) +
+                         f_minus[:, None] * (-C * W_minus + S * V_minus)).sum(axis=0)
+        out[:, 2] = k * (f_z[:, None] * (-C * V_z - S * W_z)).sum(axis=0)
+
+        if potential is not None:
+            potential[:] = self.mu / self.radius * (C * V[n, m] + S * W[n, m]).sum(axis=0)
+
+    def get_vectors(self, xyz_ITRF_np: np.ndarray, t, out: np.ndarray = None, potential: np.ndarray = None):
+        """
+        Рассчитывает векторы гравитационного ускорения для N точек.
+
+            :param xyz_ITRF_np: NumPy массив (N, 3) с координатами точек.
+            :param t: Время (секунды) от start_datetime: число или NumPy массив (N,).
+            :param out: Массив (N, 3) для записи результата. Если не задан, создаётся новый.
+            :param potential: Массив (N,) для записи гравитационного потенциала. Если не задан, не считается.
+
+        :return: NumPy массив (N, 3) с векторами гравитационного ускорения.
+        """
+        xyz_ITRF_np = np.asarray(xyz_ITRF_np, dtype=np.float64).reshape(-1, 3)
+        n = len(xyz_ITRF_np)
+        if out is None:
+            out = np.empty((n, 3))
+
+        # Угол поворота Земли, как в библиотеке gravity_ITRF
+        t_jd_from_J2000 = self.start_jd + np.broadcast_to(np.asarray(t, dtype=np.float64) / 86400, (n,)) - 2451545.0
+        theta = 2 * np.pi * (0.7790572732640 + 1.00273781191135448 * t_jd_from_J2000)
+        COS, SIN = np.cos(theta), np.sin(theta)
+
+        for start in range(0, n, self.chunk_size):
+            part = slice(start, start + self.chunk_size)
+            x, y, z = xyz_ITRF_np[part].T
+            cos, sin = COS[part], SIN[part]
+
+            # Переводим координаты из ITRF в GCRF
+            xyz_GCRF = np.column_stack((x * cos + y * sin, -x * sin + y * cos, z))
+            g_GCRF = np.empty_like(xyz_GCRF)
+            self._accelerations(xyz_GCRF, g_GCRF, None if potential is None else potential[part])
+
+            # Переводим результат обратно в ITRF
+            out[part, 0] = g_GCRF[:, 0] * cos - g_GCRF[:, 1] * sin
+            out[part, 1] = g_GCRF[:, 0] * sin + g_GCRF[:, 1] * cos
+            out[part, 2] = g_GCRF[:, 2]
+
+        return out
+
+    def get_vector(self, xyz_ITRF_np: np.ndarray, t: float):
+        right_parts = np.zeros(6)
+        self.get_vectors(xyz_ITRF_np, t, out=right_parts[3:6].reshape(1, 3))
+        return right_parts
@@ -1,9 +1,14 @@
 import math
+import os
+import sys
 import numpy as np
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation import (ResultCache, StoredTrajectory, TrajectoryWriter, cached_chunks, checkpointed_chunks,
+                         output_points_count, stream)
 from classes import Orbit
-from rkk4 import runge_kutta_4
 from grafics import start_plot
 from text_result import write_result
 
@@ -19,7 +24,15 @@ w = 1.37  # Аргумент перицентра
 nu = 0.0  # Истиная аномалия
 mu = 3.986004418 * 10 ** 14  # Гравитационный параметр
 start_datetime = datetime(2023, 11, 14, 19, 00)  # Заданные дата и время начала моделирования
-orbit = Orbit(a=a, e=e, i=i, omega=omega, w=w, nu=nu, mu=mu, start_datetime=start_datetime)
+# Модель сложного поля: 'numpy' (HarmonicGravity, не требует сборки) или 'native' (GeographicLib через ctypes,
+# нужна библиотека, собранная в Gravity/build - см. Gravity/CMakeLists.txt)
+gravity_backend = "numpy"
+N_harmonics = 10  # Степень и порядок разложения гравитационного поля
+# Файл коэффициентов для 'numpy' или каталог моделей GeographicLib для 'native'
+# (None - EGM2008 из "код Маштакова" или /opt/homebrew/Cellar/geographiclib/gravity)
+coefficients_path = None
+orbit = Orbit(a=a, e=e, i=i, omega=omega, w=w, nu=nu, mu=mu, start_datetime=start_datetime,
+              gravity_backend=gravity_backend, N_harmonics=N_harmonics, coefficients_path=coefficients_path)
 
 # Вызов метода Рунге-Кутта 4-го порядка
 T = 2 * np.pi * a ** 1.5 / mu ** 0.5  # Период обращения
@@ -27,8 +40,39 @@ end_datetime = datetime(2023, 11, 28, 22, 00)  # Заданные дата и в
 h = 0.2  # Шаг интегрирования по времени
 n = math.ceil((end_datetime - start_datetime).total_seconds() / h)  # Количество шагов
 n = 2 * math.ceil(T / h)
+# Шаг выдачи результатов не зависит от шага интегрирования: для графиков и таблиц достаточно
+# нескольких тысяч точек на виток, элементы орбиты и интеграл энергии считаются только в них
+dt_out = 2.0
+
+# Траектория сохраняется на диск, если задана папка (потом её можно открыть в replot_stored.py без интегрирования)
+store_path = None  # например, "result/other/trajectory"
+sinks = [orbit.events]  # прохождения перицентра и восходящего узла ищутся по ходу интегрирования
+if store_path is not None:
+    sinks.append(TrajectoryWriter(store_path, n_points=output_points_count(h, n, dt_out=dt_out), mu=mu, a=a, e=e,
+                                  i=i, w=w, omega=omega, nu=nu, start_datetime=start_datetime, h=h, n=n, dt_out=dt_out,
+                                  gravity_backend=gravity_backend, N_harmonics=N_harmonics,
+                                  coefficients_path=coefficients_path))
+
+# Для долгих расчётов (2 недели) траектория пишется на диск с контрольными точками:
+# после сбоя или Ctrl-C повторный запуск скрипта продолжит расчёт с последней контрольной точки
+checkpoint_path = None  # например, "result/days_14/checkpoint"
+metadata = dict(mu=mu, a=a, e=e, i=i, w=w, omega=omega, nu=nu, start_datetime=start_datetime, h=h, n=n,
+                dt_out=dt_out, gravity_backend=gravity_backend, N_harmonics=N_harmonics,
+                coefficients_path=coefficients_path)
+# Поле зависит от start_datetime и настроек модели поля, поэтому они входят в ключ кэша и контрольной точки
+model = {"name": "2_С.Orbit", "start_datetime": start_datetime, "mu": mu, "gravity": orbit.gravity.description()}
 
-runge_kutta_4(f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=n, orbit=orbit)
+if checkpoint_path is None:
+    # Один кусок на весь интервал: orbit.add_results нужен весь массив.
+    # Если такой сценарий уже считался, траектория берётся из кэша на диске без интегрирования
+    cache = ResultCache()
+    stream(cached_chunks(cache, model=model, f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0, h=h, n=n,
+                         dt_out=dt_out, metadata=metadata), orbit.add_results, *sinks)
+else:
+    stream(checkpointed_chunks(checkpoint_path, f=orbit.vector_function_right_parts, t0=orbit.t0, y0=orbit.y0,
+                               h=h, n=n, chunk_size=50000, dt_out=dt_out, metadata=metadata, model=model),
+           *sinks)
+    orbit.add_stored_results(StoredTrajectory(checkpoint_path))
 
 # строим графики
 start_plot(orbit=orbit, where_save="other")
@@ -5,27 +5,25 @@ from classes import Orbit
 
 
 def write_result(orbit: Orbit, where_save: str):
-    # Находим индексы, где значение становится меньше предыдущего
-    end_of_circle_indices = np.where(orbit.result_nu < np.roll(orbit.result_nu, 1))[0]
+    # Границы витков - прохождения перицентра, найденные во время интегрирования
+    _, states = orbit.events.get("periapsis")
+    a, e, i, w, omega, nu = orbit.from_xyz_to_elements_batch(states).T
+    nu = wrap_true_anomaly(nu)
+    rows = [[omega[k], w[k], a[k], e[k], i[k], nu[k]] for k in range(len(states))]
 
     # Создание первой таблицы
     table1 = PrettyTable()
     table1.field_names = ["Номер витка", "ДВУ", "Аргумент перицентра", "Большая полуось", "Эксцентриситет",
                           "Наклонение", "Истинная аномалия"]
     count = 0  # счетчик
-    for i in end_of_circle_indices:
+    for row in rows:
         count += 1
-        table1.add_row([count, orbit.result_omega[i],  orbit.result_w[i], orbit.result_a[i], orbit.result_e[i],
-                        orbit.result_i[i], orbit.result_nu[i]])
+        table1.add_row([count] + row)
 
     # Создание второй таблицы
     table2 = PrettyTable()
     table2.field_names = ["ДВУ", "Аргумент перицентра", "Большая полуось", "Эксцентриситет", "Наклонение"]
-    table2.add_row([orbit.result_omega[end_of_circle_indices[-1]] - orbit.result_omega[end_of_circle_indices[0]],
-                    orbit.result_w[end_of_circle_indices[-1]] - orbit.result_w[end_of_circle_indices[0]],
-                    orbit.result_a[end_of_circle_indices[-1]] - orbit.result_a[end_of_circle_indices[0]],
-                    orbit.result_e[end_of_circle_indices[-1]] - orbit.result_e[end_of_circle_indices[0]],
-                    orbit.result_i[end_of_circle_indices[-1]] - orbit.result_i[end_of_circle_indices[0]] ])
+    table2.add_row([rows[-1][k] - rows[0][k] for k in range(5)])
 
 
     # Сохранение таблиц в текстовый файл
@@ -36,3 +34,10 @@ def write_result(orbit: Orbit, where_save: str):
         file.write(str(table1))
 
 
+def wrap_true_anomaly(nu: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+    """
+    Приводит истинную аномалию к [0, 2π). В перицентре она равна нулю, но из-за округления получается
+    чуть меньше 2π; значения, отличающиеся от 2π меньше чем на tolerance (точность момента события), считаются нулём.
+    """
+    nu = np.mod(nu, 2 * np.pi)
+    return np.where(2 * np.pi - nu < tolerance, 0.0, nu)
@@ -0,0 +1,21 @@
+"""
+Общее ядро интегрирования для всех моделей (1_A, 1_B, 2_A, 2_B, 2_С).
+
+Скрипты main_*.py добавляют корень репозитория в sys.path и импортируют отсюда propagate.
+"""
+from propagation.core import propagate, kernel_function, output_points_count
+from propagation.analytic import j2_secular_rates, mean_elements_propagate, mean_elements_states
+from propagation.batch import propagate_orbits
+from propagation.cache import ResultCache, cached_chunks, scenario_key
+from propagation.checkpoint import checkpointed_chunks
+from propagation.dense import Trajectory
+from propagation.store import TrajectoryWriter, StoredTrajectory
+from propagation.streaming import propagate_chunks, stream
+from propagation.sweep import grid, run_search, run_sweep
+from propagation.events import ORBIT_EVENTS, EventDetector, ascending_node, periapsis
+from propagation.elements import (xyz_to_elements, elements_to_xyz, true_to_mean_anomaly,
+                                  mean_to_true_anomaly)
+from propagation.integrators import (INTEGRATORS, runge_kutta_4, dormand_prince_45, velocity_verlet, yoshida_4,
+                                     stormer_cowell)
+from propagation.kernels import (NUMBA_AVAILABLE, pendulum, pendulum_batch, two_body, j2, two_body_batch,
+                                 j2_batch, runge_kutta_4_loop, pendulum_closed_loop, pendulum_closed_loop_batch)
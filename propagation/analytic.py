@@ -0,0 +1,88 @@
+import numpy as np
+
+from propagation.elements import elements_to_xyz, mean_to_true_anomaly, true_to_mean_anomaly
+
+
+def j2_secular_rates(a, e, i, mu: float, J2: float, R: float) -> tuple:
+    """
+    Вековые скорости изменения элементов орбиты из-за J2 (средние элементы, первый порядок по J2).
+
+        :param a: Средняя большая полуось.
+        :param e: Эксцентриситет.
+        :param i: Наклонение.
+        :param mu: Гравитационный параметр.
+        :param J2: Коэффициент J2.
+        :param R: Экваториальный радиус Земли.
+
+    :return: Скорости аргумента перицентра, долготы восходящего узла и средней аномалии (рад/с).
+    """
+    n = np.sqrt(mu / a ** 3)
+    p = a * (1 - e ** 2)
+    k = 3 / 4 * n * J2 * (R / p) ** 2
+    cos_i = np.cos(i)
+
+    dot_w = k * (5 * cos_i ** 2 - 1)
+    dot_omega = -2 * k * cos_i
+    dot_M = n + k * np.sqrt(1 - e ** 2) * (3 * cos_i ** 2 - 1)
+    return dot_w, dot_omega, dot_M
+
+
+def _short_period_a(a, e, i, w, nu, J2: float, R: float):
+    # Короткопериодическая поправка к большой полуоси (Брауэр, первый порядок): a_оск = a_ср * (1 + поправка)
+    p = a * (1 - e ** 2)
+    a_r = (1 + e * np.cos(nu)) / (1 - e ** 2)  # a / r
+    cos_i2 = np.cos(i) ** 2
+    gamma = J2 / 2 * (R / a) ** 2
+    return gamma * ((3 * cos_i2 - 1) * (a_r ** 3 - (a / p) ** 1.5) +
+                    3 * (1 - cos_i2) * a_r ** 3 * np.cos(2 * (w + nu)))
+
+
+def mean_elements_propagate(elements: np.ndarray, t: np.ndarray, mu: float, J2: float, R: float, t0: float = 0,
+                            short_period: bool = True) -> np.ndarray:
+    """
+    Аналитический прогноз орбиты с J2: средние элементы меняются с постоянными вековыми скоростями
+    (j2_secular_rates), поэтому элементы в любой момент считаются сразу, без интегрирования,
+    за O(1) на каждый момент времени.
+
+    При short_period=True начальная оскулирующая большая полуось переводится в среднюю, а в моменты t
+    короткопериодическая поправка добавляется обратно. Это главная поправка: без неё период обращения
+    ошибается на величину порядка J2 (десятки секунд за виток на низкой орбите). Остальные элементы
+    принимаются средними без поправок, поэтому положение отличается от численного решения на величину
+    порядка J2 * R (километры) - этого достаточно для быстрой оценки, точный расчёт - propagate.
+
+        :param elements: Начальные оскулирующие элементы (a, e, i, w, omega, nu) в момент t0.
+        :param t: Число или NumPy массив моментов времени.
+        :param mu: Гравитационный параметр.
+        :param J2: Коэффициент J2.
+        :param R: Экваториальный радиус Земли.
+        :param t0: Момент начальных элементов.
+        :param short_period: Учитывать короткопериодическую поправку к большой полуоси.
+
+    :return: NumPy массив (len(t), 6) с элементами орбиты (a, e, i, w, omega, nu) в моменты t.
+    """
+    a, e, i, w, omega, nu = np.asarray(elements, dtype=np.float64)
+    t = np.atleast_1d(np.asarray(t, dtype=np.float64)) - t0
+
+    a_mean = a / (1 + _short_period_a(a, e, i, w, nu, J2, R)) if short_period else a
+    dot_w, dot_omega, dot_M = j2_secular_rates(a_mean, e, i, mu, J2, R)
+
+    result = np.empty((len(t), 6))
+    result[:, 0] = a_mean
+    result[:, 1] = e
+    result[:, 2] = i
+    result[:, 3] = w + dot_w * t
+    result[:, 4] = omega + dot_omega * t
+    result[:, 5] = mean_to_true_anomaly(true_to_mean_anomaly(nu, e) + dot_M * t, e)
+    if short_period:
+        result[:, 0] *= 1 + _short_period_a(a_mean, e, i, result[:, 3], result[:, 5], J2, R)
+    return result
+
+
+def mean_elements_states(elements: np.ndarray, t: np.ndarray, mu: float, J2: float, R: float, t0: float = 0,
+                         short_period: bool = True) -> np.ndarray:
+    """
+    Векторы состояния в моменты t по аналитическому прогнозу mean_elements_propagate.
+
+    :return: NumPy массив (len(t), 6) с векторами состояния в декартовых координатах.
+    """
+    return elements_to_xyz(mean_elements_propagate(elements, t, mu, J2, R, t0=t0, short_period=short_period), mu)
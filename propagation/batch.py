@@ -0,0 +1,48 @@
+import numpy as np
+
+from propagation.core import propagate
+from propagation.kernels import NUMBA_AVAILABLE
+
+
+def propagate_orbits(orbits: list, h, n: int, method: str = "rk4", step_hook=None, **options) -> tuple:
+    """
+    Интегрирует N орбит одной модели как один массив состояний (N, 6).
+
+    Правые части считаются сразу для всех спутников: скомпилированным ядром orbit.rhs_batch_kernel
+    (если оно есть, включено compiled_rhs и установлена numba) или методом
+    orbit.vector_function_right_parts_batch на массивах NumPy. Модель (параметры, эпоха, поле)
+    берётся у первой орбиты, поэтому все орбиты должны быть одного класса с одинаковыми rhs_params.
+    После интегрирования каждая орбита получает свои результаты через orbit.add_results(t, y[:, k]).
+
+        :param orbits: Список объектов Orbit (2_A, 2_B или 2_С).
+        :param h: Шаг интегрирования (для "dopri45" - начальный шаг).
+        :param n: Количество шагов.
+        :param method: Название метода интегрирования из INTEGRATORS.
+        :param step_hook: Функция step_hook(i, t, y), вызываемая перед каждым шагом (y - массив (N, 6)).
+        :param options: Дополнительные параметры метода (например, rtol и atol для "dopri45").
+
+    :return: Массив значений t и массив значений y формы (n + 1, N, 6).
+    """
+    if not orbits:
+        raise ValueError("Список орбит пуст")
+
+    lead = orbits[0]
+    params = getattr(lead, 'rhs_params', None)
+    for orbit in orbits[1:]:
+        if type(orbit) is not type(lead) or orbit.t0 != lead.t0:
+            raise ValueError("Все орбиты должны быть одного класса и с одинаковым t0")
+        if params is not None and not np.array_equal(orbit.rhs_params, params):
+            raise ValueError("Все орбиты должны иметь одинаковые параметры модели rhs_params")
+
+    y0 = np.stack([orbit.y0 for orbit in orbits])
+    kernel = getattr(lead, 'rhs_batch_kernel', None)
+    if kernel is not None and getattr(lead, 'compiled_rhs', False) and NUMBA_AVAILABLE:
+        t, y = propagate(None, lead.t0, y0, h, n, method=method, step_hook=step_hook,
+                         kernel=kernel, params=params, **options)
+    else:
+        t, y = propagate(lead.vector_function_right_parts_batch, lead.t0, y0, h, n, method=method,
+                         step_hook=step_hook, **options)
+
+    for k, orbit in enumerate(orbits):
+        orbit.add_results(t, y[:, k])
+    return t, y
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from propagation.core import output_points_count
+from propagation.store import StoredTrajectory, TrajectoryWriter
+from propagation.streaming import propagate_chunks
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "modeling_angular_motion")
+
+
+def scenario_key(model, t0: float, y0: np.ndarray, h, n: int, method: str, params: np.ndarray = None,
+                 **options) -> str:
+    """
+    Хэш сценария интегрирования: модель, параметры, начальное состояние, шаг, количество шагов и метод.
+
+        :param model: Название модели (например, "2_B.Orbit") или словарь с названием и настройками модели,
+                      которых нет в params (например, start_datetime). При изменении кода модели название
+                      нужно менять (или очищать кэш), иначе будут возвращаться старые траектории.
+        :param t0: Начальное значение t.
+        :param y0: Начальное значение y (массив значений).
+        :param h: Шаг интегрирования.
+        :param n: Количество шагов.
+        :param method: Название метода интегрирования.
+        :param params: NumPy массив параметров модели (например, orbit.rhs_params).
+        :param options: Дополнительные параметры метода.
+
+    :return: Строка sha256 из 64 шестнадцатеричных символов.
+    """
+    description = json.dumps({"model": model, "t0": float(t0).hex(), "h": float(h).hex(), "n": int(n),
+                              "method": method, "options": {key: repr(value) for key, value in options.items()}},
+                             sort_keys=True, default=str)
+    sha256 = hashlib.sha256(description.encode("utf-8"))
+    for array in (y0, params):
+        array = np.ascontiguousarray(array if array is not None else [], dtype=np.float64)
+        sha256.update(repr(array.shape).encode("utf-8"))
+        sha256.update(array.tobytes())
+    return sha256.hexdigest()
+
+
+class ResultCache:
+    """
+    Кэш траекторий на локальном диске. Каждая запись - папка с файлами TrajectoryWriter, названная хэшем сценария.
+    Когда общий размер превышает max_bytes, удаляются записи, к которым дольше всего не обращались.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 5 * 1024 ** 3):
+        """
+            :param path: Папка кэша (создаётся, если её нет).
+            :param max_bytes: Максимальный общий размер записей в байтах.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def get(self, key: str):
+        """
+        Возвращает сохранённую траекторию (StoredTrajectory) или None, если записи нет.
+        """
+        path = self.entry_path(key)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None
+        os.utime(path)  # время последнего обращения для вытеснения
+        return StoredTrajectory(path)
+
+    def writer(self, key: str, n_points: int, state_shape: tuple = (6,), **metadata):
+        """
+        Возвращает TrajectoryWriter для новой записи. Запись появляется в кэше только после commit.
+        """
+        path = self.entry_path(key) + ".tmp"
+        shutil.rmtree(path, ignore_errors=True)
+        return TrajectoryWriter(path, n_points=n_points, state_shape=state_shape, **metadata)
+
+    def commit(self, key: str, writer: TrajectoryWriter):
+        """
+        Закрывает writer, переносит запись в кэш и вытесняет старые записи, если кэш переполнен.
+        """
+        writer.close()
+        path = self.entry_path(key)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(writer.path, path)
+        self.evict()
+
+    def discard(self, writer: TrajectoryWriter):
+        """
+        Удаляет незаконченную запись.
+        """
+        shutil.rmtree(writer.path, ignore_errors=True)
+
+    def evict(self):
+        """
+        Удаляет записи, к которым дольше всего не обращались, пока общий размер больше max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if name.endswith(".tmp") or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+def cached_chunks(cache: ResultCache, model, f, t0: float, y0: np.ndarray, h, n: int, chunk_size: int = None,
+                  method: str = "rk4", step_hook=None, kernel=None, params: np.ndarray = None, every: int = 1,
+                  dt_out: float = None, metadata: dict = None, **options):
+    """
+    propagate_chunks с кэшем результатов. Если такой сценарий уже считался, траектория целиком отдаётся одним
+    куском из кэша (массивы отображены в память) и интегрирование не выполняется; иначе куски интегрируются,
+    по дороге записываются в кэш и отдаются как в propagate_chunks.
+
+    При попадании в кэш step_hook не вызывается, поэтому сценарии с побочными эффектами в step_hook
+    (например, шум в управлении) кэшировать не нужно. "dopri45" не кэшируется: количество точек заранее неизвестно.
+
+        :param cache: Кэш результатов.
+        :param model: Название модели для ключа кэша (см. scenario_key).
+        :param f: Функция f(t, y) правых частей (может быть None, если задано ядро).
+        :param t0: Начальное значение t.
+        :param y0: Начальное значение y (массив значений).
+        :param h: Шаг интегрирования.
+        :param n: Количество шагов.
+        :param chunk_size: Количество шагов в одном куске (по умолчанию - весь интервал одним куском).
+        :param method: Название метода интегрирования из INTEGRATORS.
+        :param step_hook: Функция step_hook(i, t, y), вызываемая перед каждым шагом.
+        :param kernel: Ядро правых частей kernel(t, y, params, out) из модуля kernels.
+        :param params: NumPy массив параметров ядра (или модели, если ядра нет).
+        :param every: Выдавать каждую every-ю точку сетки интегрирования (в кэш пишутся только точки выдачи).
+        :param dt_out: Выдавать точки через dt_out секунд (вместо every).
+        :param metadata: Параметры расчёта для meta.json записи (начальные элементы, mu, start_datetime).
+        :param options: Дополнительные параметры метода.
+
+    :return: Генератор пар (t, y), как у propagate_chunks.
+    """
+    chunk_size = chunk_size or max(n, 1)
+    chunks = propagate_chunks(f, t0, y0, h, n, chunk_size=chunk_size, method=method, step_hook=step_hook,
+                              kernel=kernel, params=params, every=every, dt_out=dt_out, **options)
+    if method == "dopri45":
+        yield from chunks
+        return
+
+    # Многошаговый метод заново разгоняется в каждом куске, поэтому траектория зависит от размера куска
+    key_options = dict(options, chunk_size=chunk_size) if method == "stormer_cowell" else dict(options)
+    # Скомпилированное ядро и функция f могут расходиться в последних знаках
+    key_options["kernel"] = getattr(kernel, "__name__", None)
+    if every != 1 or dt_out is not None:
+        key_options.update(every=every, dt_out=dt_out)
+    key = scenario_key(model, t0, y0, h, n, method, params=params, **key_options)
+    trajectory = cache.get(key)
+    if trajectory is not None:
+        yield trajectory.t, trajectory.y
+        return
+
+    writer = cache.writer(key, n_points=output_points_count(h, n, every, dt_out, method), state_shape=np.shape(y0),
+                          **(metadata or {}))
+    try:
+        for t, y in chunks:
+            writer(t, y)
+            yield t, y
+    except BaseException:
+        cache.discard(writer)
+        raise
+    cache.commit(key, writer)
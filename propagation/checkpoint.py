@@ -0,0 +1,131 @@
+import os
+import pickle
+
+import numpy as np
+
+from propagation.cache import scenario_key
+from propagation.core import output_cadence, output_points_count
+from propagation.store import TrajectoryWriter
+from propagation.streaming import propagate_from
+
+CHECKPOINT_FILE = "checkpoint.pkl"
+
+
+def _get_rng_state(rng):
+    # numpy.random.Generator хранит состояние в bit_generator, RandomState, модуль numpy.random и объекты
+    # с собственным состоянием (например, управление с заранее сгенерированным блоком шума) - в get_state()
+    if rng is None:
+        return None
+    if isinstance(rng, np.random.Generator):
+        return rng.bit_generator.state
+    return rng.get_state()
+
+
+def _set_rng_state(rng, state):
+    if rng is None:
+        return
+    if isinstance(rng, np.random.Generator):
+        rng.bit_generator.state = state
+    else:
+        rng.set_state(state)
+
+
+def checkpointed_chunks(path: str, f, t0: float, y0: np.ndarray, h, n: int, chunk_size: int = 100000,
+                        method: str = "rk4", step_hook=None, kernel=None, params: np.ndarray = None, every: int = 1,
+                        dt_out: float = None, rng=None, metadata: dict = None, model=None, **options):
+    """
+    propagate_chunks с контрольными точками. Каждый кусок дописывается в файлы траектории в папке path
+    (TrajectoryWriter), после чего в checkpoint.pkl сохраняются счётчики шагов и состояние генератора
+    случайных чисел rng. Повторный вызов с теми же аргументами продолжает расчёт с последней контрольной точки
+    и приходит к тому же результату бит в бит, что и расчёт без перерыва с тем же chunk_size.
+    Уже посчитанная часть отдаётся первым куском (массивы отображены в память).
+    После завершения папка path - обычная сохранённая траектория (StoredTrajectory).
+
+    Состояние, которое step_hook накапливает в своих объектах (например, журнал управления),
+    не сохраняется - после продолжения в нём будет только новая часть расчёта.
+
+    Расчёт продолжается с последней записанной точки, поэтому при шаге выдачи every кусок должен состоять
+    из целого числа шагов выдачи (chunk_size кратен every), а dt_out должен быть кратен h.
+
+        :param path: Папка для траектории и контрольной точки.
+        :param f: Функция f(t, y) правых частей (может быть None, если задано ядро).
+        :param t0: Начальное значение t.
+        :param y0: Начальное значение y (массив значений).
+        :param h: Шаг интегрирования.
+        :param n: Количество шагов.
+        :param chunk_size: Количество шагов между контрольными точками.
+        :param method: Название метода интегрирования из INTEGRATORS (кроме "dopri45").
+        :param step_hook: Функция step_hook(i, t, y), вызываемая перед каждым шагом.
+        :param kernel: Ядро правых частей kernel(t, y, params, out) из модуля kernels.
+        :param params: NumPy массив параметров ядра.
+        :param every: Выдавать каждую every-ю точку сетки интегрирования (на диск пишутся только точки выдачи).
+        :param dt_out: Выдавать точки через dt_out секунд (кратно h, вместо every).
+        :param rng: Генератор случайных чисел, используемый в step_hook или f (numpy.random.Generator,
+                    RandomState или модуль numpy.random), состояние которого сохраняется в контрольной точке.
+                    Если step_hook берёт шум из заранее сгенерированного блока, одного состояния генератора
+                    мало: нужен объект с методами get_state() и set_state(state), сохраняющий и блок
+                    (например, Control из 1_B вместе с удерживаемым управлением).
+        :param metadata: Параметры расчёта для meta.json (начальные элементы, mu, start_datetime).
+        :param model: Описание модели для ключа контрольной точки (см. scenario_key): всё, от чего зависит f,
+                      но чего нет в остальных аргументах (например, start_datetime, mu и настройки модели поля).
+                      Контрольная точка, записанная с другим model, не продолжается.
+        :param options: Дополнительные параметры метода.
+
+    :return: Генератор пар (t, y), как у propagate_chunks.
+    """
+    if method == "dopri45":
+        raise ValueError("Контрольные точки поддерживаются только для методов с постоянным шагом")
+    if chunk_size < 1:
+        raise ValueError("chunk_size должен быть положительным")
+    every, dt_out = output_cadence(method, h, every, dt_out)
+    if dt_out is not None or chunk_size % every != 0:
+        raise ValueError("Для контрольных точек шаг выдачи должен быть кратен h, а chunk_size - кратен шагу выдачи")
+
+    key_options = dict(options, every=every) if every != 1 else dict(options)
+    key = scenario_key("checkpoint" if model is None else {"checkpoint": model}, t0, y0, h, n, method, params=params,
+                       chunk_size=chunk_size, kernel=getattr(kernel, "__name__", None), **key_options)
+    checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+    metadata = dict(metadata or {})
+    writer_options = dict(n_points=output_points_count(h, n, every), state_shape=np.shape(y0), **metadata)
+
+    checkpoint = None
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, "rb") as file:
+            checkpoint = pickle.load(file)
+        if checkpoint["key"] != key:
+            raise ValueError(f"Контрольная точка в {path} относится к другому сценарию")
+
+    if checkpoint is None:
+        writer = TrajectoryWriter(path, **writer_options)
+        if os.path.exists(os.path.join(path, "meta.json")):
+            os.remove(os.path.join(path, "meta.json"))  # траектория в папке ещё не закончена
+        t_i, y_i, done, offset = t0, np.asarray(y0, dtype=np.float64), 0, 0
+    else:
+        writer = TrajectoryWriter(path, length=checkpoint["length"], **writer_options)
+        done, offset = checkpoint["done"], checkpoint["offset"]
+        _set_rng_state(rng, checkpoint["rng_state"])
+
+        # Уже посчитанная часть; последняя её точка - начальная точка продолжения
+        length = checkpoint["length"]
+        t_i, y_i = writer.t[length - 1], np.array(writer.y[length - 1])
+        yield writer.t[:length], writer.y[:length]
+
+    if n == 0 and checkpoint is None:
+        writer(np.array([t0]), y_i[np.newaxis])
+        yield writer.t[:1], writer.y[:1]
+
+    for t, y, done, offset in propagate_from(f, t_i, y_i, h, n, chunk_size, done, offset, method=method,
+                                             step_hook=step_hook, kernel=kernel, params=params, every=every,
+                                             **options):
+        writer(t, y)
+        writer.flush()
+
+        # Контрольная точка пишется во временный файл и подменяет старую целиком
+        with open(checkpoint_path + ".tmp", "wb") as file:
+            pickle.dump({"key": key, "done": done, "offset": offset, "length": writer.length,
+                         "rng_state": _get_rng_state(rng)}, file)
+        os.replace(checkpoint_path + ".tmp", checkpoint_path)
+        yield t, y
+
+    writer.close()
+
@@ -0,0 +1,158 @@
+import math
+
+import numpy as np
+
+from propagation.dense import Trajectory
+from propagation.integrators import INTEGRATORS
+from propagation.kernels import runge_kutta_4_loop
+
+
+def kernel_function(kernel, params: np.ndarray):
+    """
+    Превращает ядро kernel(t, y, params, out) из модуля kernels в функцию f(t, y) для интеграторов.
+    Многомерное состояние (например, (N, 6) для N спутников) передаётся ядру плоским массивом.
+
+        :param kernel: Ядро правых частей.
+        :param params: NumPy массив параметров ядра.
+
+    :return: Функция f(t, y), возвращающая новый массив правых частей.
+    """
+    def f(t, y):
+        return kernel(t, y.ravel(), params, np.empty(y.size)).reshape(y.shape)
+
+    return f
+
+
+def output_cadence(method: str, h, every: int = 1, dt_out: float = None) -> tuple:
+    """
+    Проверяет шаг выдачи результатов. Шаг dt_out, кратный шагу интегрирования h, у методов с постоянным
+    шагом заменяется на every = dt_out / h, чтобы точки выдачи были узлами сетки, а не интерполяцией.
+
+        :param method: Название метода интегрирования.
+        :param h: Шаг интегрирования.
+        :param every: Выдавать каждую every-ю точку сетки интегрирования.
+        :param dt_out: Выдавать точки через dt_out секунд (вместо every).
+
+    :return: Пара (every, dt_out), в которой dt_out = None, если выдача идёт по узлам сетки.
+    """
+    if every < 1:
+        raise ValueError("every должен быть положительным")
+    if dt_out is None:
+        return int(every), None
+    if every != 1:
+        raise ValueError("Шаг выдачи задаётся либо every, либо dt_out")
+    if dt_out <= 0:
+        raise ValueError("dt_out должен быть положительным")
+
+    ratio = dt_out / h
+    if method != "dopri45" and abs(ratio - round(ratio)) <= 1e-9 * ratio and round(ratio) >= 1:
+        return int(round(ratio)), None
+    return 1, float(dt_out)
+
+
+def output_points_count(h, n: int, every: int = 1, dt_out: float = None, method: str = "rk4") -> int:
+    """
+    Количество точек выдачи для n шагов длины h (для выделения места под траекторию, например в TrajectoryWriter).
+    """
+    every, dt_out = output_cadence(method, h, every, dt_out)
+    if dt_out is None:
+        return n // every + 1 + (1 if n % every else 0)
+    span = n * h
+    count = math.floor(span / dt_out * (1 + 1e-12)) + 1
+    return count + (1 if (count - 1) * dt_out < span * (1 - 1e-12) else 0)
+
+
+def select_output(t: np.ndarray, y: np.ndarray, f, every: int = 1, dt_out: float = None, start: int = 0,
+                  origin: float = None, first: bool = True, last: bool = True) -> tuple:
+    """
+    Оставляет из куска траектории только точки выдачи: узлы с номером, кратным every, или моменты
+    origin + j * dt_out (значения в них берутся из плотной выдачи Trajectory).
+
+        :param t: Массив значений t куска.
+        :param y: Массив значений y куска.
+        :param f: Функция f(t, y) правых частей (нужна только при dt_out).
+        :param every: Выдавать каждую every-ю точку сетки интегрирования.
+        :param dt_out: Выдавать точки через dt_out секунд.
+        :param start: Сквозной номер первой точки куска.
+        :param origin: Начало сетки моментов выдачи (по умолчанию t[0]).
+        :param first: Выдавать первую точку куска, если она попадает на сетку выдачи.
+        :param last: Всегда выдавать последнюю точку куска (конец траектории).
+
+    :return: Массив значений t и массив значений y в точках выдачи.
+    """
+    if dt_out is None:
+        indices = np.arange(len(t))
+        keep = (start + indices) % every == 0
+        keep[0] &= first
+        if last:
+            keep[-1] = True
+        return t[keep], y[keep]
+
+    origin = t[0] if origin is None else origin
+    eps = 1e-9 * dt_out
+    j = np.arange(math.ceil((t[0] - origin - eps) / dt_out), math.floor((t[-1] - origin + eps) / dt_out) + 1)
+    times = np.clip(origin + j * dt_out, t[0], t[-1])
+    if not first:
+        times = times[times > t[0] + eps]
+    if last and (len(times) == 0 or times[-1] < t[-1] - eps):
+        times = np.append(times, t[-1])
+    if len(t) < 2:
+        return t[:len(times)], y[:len(times)]
+    return times, Trajectory(t, y, f).at(times)
+
+
+def propagate(f, t0: float, y0: np.ndarray, h, n: int, method: str = "rk4", step_hook=None, sink=None,
+              kernel=None, params: np.ndarray = None, every: int = 1, dt_out: float = None, **options) -> tuple:
+    """
+    Общая точка входа для интегрирования всех моделей.
+
+    Если задано ядро kernel, метод "rk4" и нет step_hook, весь цикл выполняется в скомпилированном коде
+    (runge_kutta_4_loop). Иначе вызывается метод method из INTEGRATORS с функцией f
+    (или с функцией, построенной по ядру, если f не задана).
+
+    Шаг выдачи результатов (every или dt_out) не зависит от шага интегрирования h: в sink и в результат попадают
+    только точки выдачи и последняя точка, поэтому производные величины (элементы орбиты, интегралы) считаются
+    только в них. Скомпилированный цикл сразу хранит только точки выдачи.
+
+        :param f: Функция f(t, y) правых частей (может быть None, если задано ядро).
+        :param t0: Начальное значение t.
+        :param y0: Начальное значение y (массив значений).
+        :param h: Шаг интегрирования (для "dopri45" - начальный шаг).
+        :param n: Количество шагов.
+        :param method: Название метода интегрирования из INTEGRATORS.
+        :param step_hook: Функция step_hook(i, t, y), вызываемая перед каждым шагом.
+        :param sink: Приёмник результатов sink(t, y), например orbit.add_results.
+        :param kernel: Ядро правых частей kernel(t, y, params, out) из модуля kernels.
+        :param params: NumPy массив параметров ядра.
+        :param every: Выдавать каждую every-ю точку сетки интегрирования.
+        :param dt_out: Выдавать точки через dt_out секунд (вместо every; если dt_out не кратен h или метод
+                       "dopri45", значения берутся из плотной выдачи).
+        :param options: Дополнительные параметры метода (например, rtol и atol для "dopri45").
+
+    :return: Массив значений t и массив значений y в точках выдачи.
+    """
+    if method not in INTEGRATORS:
+        raise ValueError(f"Неизвестный метод интегрирования: {method}. Доступны: {', '.join(INTEGRATORS)}")
+
+    every, dt_out = output_cadence(method, h, every, dt_out)
+
+    if kernel is not None and method == "rk4" and step_hook is None and not options:
+        y0 = np.asarray(y0, dtype=np.float64)
+        t, y = runge_kutta_4_loop(kernel, float(t0), y0.ravel(), float(h), int(n), np.asarray(params, dtype=np.float64),
+                                  every)
+        y = y.reshape((len(t),) + y0.shape)
+        if dt_out is not None:
+            t, y = select_output(t, y, f or kernel_function(kernel, np.asarray(params, dtype=np.float64)),
+                                 dt_out=dt_out)
+    else:
+        if f is None:
+            if kernel is None:
+                raise ValueError("Нужно задать функцию правых частей f или ядро kernel")
+            f = kernel_function(kernel, np.asarray(params, dtype=np.float64))
+        t, y = INTEGRATORS[method](f, t0, y0, h, n, step_hook=step_hook, **options)
+        if every != 1 or dt_out is not None:
+            t, y = select_output(t, y, f, every=every, dt_out=dt_out)
+
+    if sink is not None:
+        sink(t, y)
+    return t, y
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class Trajectory:
+    """
+    Траектория с плотной выдачей: значения в любые моменты времени между узлами сетки интегрирования
+    по интерполяции Эрмита. Производные в узлах считаются функцией правых частей f только для тех узлов,
+    которые нужны запрошенным моментам, и запоминаются.
+
+    Для уравнений движения y = (r, v), dy/dt = (v, a) (second_order=True) положение интерполируется
+    многочленом 5-й степени по r, v, a на концах интервала, скорость - многочленом 3-й степени по v и a.
+    Иначе весь вектор состояния интерполируется многочленом 3-й степени по y и dy/dt.
+    """
+
+    def __init__(self, t: np.ndarray, y: np.ndarray, f, second_order: bool = False):
+        """
+            :param t: Массив значений t (узлы, по возрастанию).
+            :param y: Массив значений y в узлах.
+            :param f: Функция f(t, y) правых частей, которой считалась траектория.
+            :param second_order: Вектор состояния имеет вид (r, v), а правые части - (v, a).
+        """
+        if len(t) < 2:
+            raise ValueError("Для интерполяции нужно хотя бы две точки траектории")
+        self.t = t
+        self.y = y
+        self.f = f
+        self.second_order = second_order
+        self.dy = np.empty(np.shape(y))
+        self.has_dy = np.zeros(len(t), dtype=bool)
+
+    def derivatives(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        Возвращает производные dy/dt в узлах nodes, досчитывая недостающие.
+        """
+        for k in np.unique(nodes[~self.has_dy[nodes]]):
+            self.dy[k] = self.f(self.t[k], self.y[k])
+            self.has_dy[k] = True
+        return self.dy[nodes]
+
+    def at(self, times) -> np.ndarray:
+        """
+        Значения вектора состояния в моменты times.
+
+            :param times: Число или NumPy массив моментов времени внутри [t[0], t[-1]].
+
+        :return: NumPy массив значений y (для числа - один вектор состояния).
+        """
+        times = np.asarray(times, dtype=np.float64)
+        scalar = times.ndim == 0
+        times = np.atleast_1d(times)
+        if np.any(times < self.t[0]) or np.any(times > self.t[-1]):
+            raise ValueError(f"Моменты времени должны быть внутри [{self.t[0]}, {self.t[-1]}]")
+
+        # Интервал [t_k, t_k+1], в который попадает каждый момент
+        k = np.clip(np.searchsorted(self.t, times, side="right") - 1, 0, len(self.t) - 2)
+        dt = (self.t[k + 1] - self.t[k])
+        s = ((times - self.t[k]) / dt).reshape((-1,) + (1,) * (np.ndim(self.y) - 1))
+        dt = dt.reshape(s.shape)
+
+        y0, y1 = self.y[k], self.y[k + 1]
+        dy0, dy1 = self.derivatives(k), self.derivatives(k + 1)
+
+        # Кубический многочлен Эрмита по значениям и производным на концах интервала
+        s2, s3 = s ** 2, s ** 3
+        result = (2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * dt * dy0 + \
+            (-2 * s3 + 3 * s2) * y1 + (s3 - s2) * dt * dy1
+
+        if self.second_order:
+            # Положение - многочлен Эрмита 5-й степени по r, v = dr/dt и a = dv/dt на концах интервала
+            d = np.shape(self.y)[-1] // 2
+            s4, s5 = s ** 4, s ** 5
+            result[..., :d] = (1 - 10 * s3 + 15 * s4 - 6 * s5) * y0[..., :d] + \
+                (s - 6 * s3 + 8 * s4 - 3 * s5) * dt * y0[..., d:] + \
+                (s2 - 3 * s3 + 3 * s4 - s5) / 2 * dt ** 2 * dy0[..., d:] + \
+                (s3 - 2 * s4 + s5) / 2 * dt ** 2 * dy1[..., d:] + \
+                (-4 * s3 + 7 * s4 - 3 * s5) * dt * y1[..., d:] + \
+                (10 * s3 - 15 * s4 + 6 * s5) * y1[..., :d]
+
+        return result[0] if scalar else result
@@ -0,0 +1,120 @@
+import numpy as np
+
+
+def _row_dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # Скалярное произведение по строкам массивов (N, 3)
+    return np.einsum('ij,ij->i', a, b)
+
+
+def _row_norm(a: np.ndarray) -> np.ndarray:
+    # Длина каждой строки массива (N, 3)
+    return np.sqrt(_row_dot(a, a))
+
+
+def xyz_to_elements(xyz_coords: np.ndarray, mu: float) -> np.ndarray:
+    """
+    Рассчитывает орбитальные элементы сразу для многих векторов состояния.
+    Повторяет формулы Orbit.from_xyz_to_elements, но считает по строкам массива без цикла Python.
+
+        :param xyz_coords: NumPy массив (N, 6) с векторами состояния в декартовых координатах.
+        :param mu: Гравитационный параметр.
+
+        :return: NumPy массив (N, 6) с орбитальными элементами (a, e, i, w, omega, nu).
+    """
+    xyz_coords = np.asarray(xyz_coords, dtype=np.float64).reshape(-1, 6)
+    r = xyz_coords[:, 0:3]
+    v = xyz_coords[:, 3:]
+
+    # первые интегралы
+    c = np.cross(r, v)
+    f = np.cross(v, c) - mu * r / _row_norm(r)[:, np.newaxis]
+
+    # находим еще два новых базисных вектора в дополнении к с (Oz x c = (-c_y, c_x, 0))
+    l = np.cross([0, 0, 1], c)
+    l /= _row_norm(l)[:, np.newaxis]
+    m = np.cross(c, l)
+    m /= _row_norm(m)[:, np.newaxis]
+
+    # находим элементы орбиты
+    elements = np.empty((len(xyz_coords), 6))
+    elements[:, 2] = np.arccos(c[:, 2] / _row_norm(c))
+    elements[:, 4] = np.arctan2(l[:, 1], l[:, 0])
+    elements[:, 3] = np.arctan2(_row_dot(f, m), _row_dot(f, l))
+    nu = np.arctan2(_row_dot(r, m), _row_dot(r, l)) - elements[:, 3]
+    elements[:, 5] = np.where(nu < 0, nu + 2 * np.pi, nu)  # Добавляем 2π радиан
+    elements[:, 1] = _row_norm(f) / mu
+    elements[:, 0] = _row_dot(c, c) / (mu * (1 - elements[:, 1] ** 2))
+
+    return elements
+
+
+def elements_to_xyz(elements: np.ndarray, mu: float) -> np.ndarray:
+    """
+    Рассчитывает векторы состояния в декартовой системе координат сразу для многих наборов орбитальных элементов.
+    Повторяет формулы Orbit.from_elements_to_xyz; синусы и косинусы углов считаются один раз для всего массива.
+
+        :param elements: NumPy массив (N, 6) с орбитальными элементами (a, e, i, w, omega, nu).
+        :param mu: Гравитационный параметр.
+
+        :return: NumPy массив (N, 6) с векторами состояния в декартовых координатах.
+    """
+    a, e, i, w, omega, nu = np.asarray(elements, dtype=np.float64).reshape(-1, 6).T
+
+    # эксцентрическая аномалия
+    E = 2 * np.arctan(np.sqrt((1 - e) / (1 + e)) * np.tan(nu / 2))
+    # малая полуось
+    b = a * np.sqrt(1 - e ** 2)
+    # модуль скорости в перицентрической системе
+    k = np.sqrt(mu / (a * (1 - e ** 2)))
+
+    # вектор состояния в орбитальной системе коррдинат ξη (ζ = 0)
+    xi, eta = a * (np.cos(E) - e), b * np.sin(E)
+    cos_nu, sin_nu = np.cos(nu), np.sin(nu)
+    dot_xi, dot_eta = -k * sin_nu, k * (cos_nu + e)
+
+    # первые два столбца матрицы перехода A (третий умножается на ζ = 0)
+    cos_o, sin_o = np.cos(omega), np.sin(omega)
+    cos_w, sin_w = np.cos(w), np.sin(w)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+    P = np.column_stack((cos_o * cos_w - sin_o * sin_w * cos_i,
+                         sin_o * cos_w + cos_o * sin_w * cos_i,
+                         sin_w * sin_i))
+    Q = np.column_stack((-cos_o * sin_w - sin_o * cos_w * cos_i,
+                         -sin_o * sin_w + cos_o * cos_w * cos_i,
+                         cos_w * sin_i))
+
+    xyz_coords = np.empty((len(a), 6))
+    xyz_coords[:, 0:3] = xi[:, np.newaxis] * P + eta[:, np.newaxis] * Q
+    xyz_coords[:, 3:6] = dot_xi[:, np.newaxis] * P + dot_eta[:, np.newaxis] * Q
+    return xyz_coords
+
+
+def true_to_mean_anomaly(nu: np.ndarray, e: np.ndarray) -> np.ndarray:
+    """
+    Средняя аномалия M по истинной аномалии nu (через эксцентрическую аномалию).
+    """
+    E = 2 * np.arctan(np.sqrt((1 - e) / (1 + e)) * np.tan(nu / 2))
+    return E - e * np.sin(E)
+
+
+def mean_to_true_anomaly(M: np.ndarray, e: np.ndarray, tolerance: float = 1e-14) -> np.ndarray:
+    """
+    Истинная аномалия nu по средней аномалии M: уравнение Кеплера E - e sin E = M решается методом Ньютона
+    сразу для всего массива.
+
+        :param M: Средняя аномалия (число или NumPy массив).
+        :param e: Эксцентриситет (число или массив той же формы).
+        :param tolerance: Точность эксцентрической аномалии (радианы).
+
+    :return: NumPy массив истинных аномалий в диапазоне [0, 2π).
+    """
+    M = np.mod(M, 2 * np.pi)
+    e = np.broadcast_to(e, np.shape(M))
+    E = np.where(e < 0.8, M, np.pi)
+    for _ in range(50):
+        delta = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+        E = E - delta
+        if np.all(np.abs(delta) <= tolerance):
+            break
+    nu = 2 * np.arctan2(np.sqrt(1 + e) * np.sin(E / 2), np.sqrt(1 - e) * np.cos(E / 2))
+    return np.mod(nu, 2 * np.pi)
@@ -0,0 +1,125 @@
+import numpy as np
+
+from propagation.dense import Trajectory
+
+
+def ascending_node(t, y):
+    """
+    Функция события для прохождения восходящего узла: z, переходящая через ноль снизу вверх.
+    """
+    return y[..., 2]
+
+
+def periapsis(t, y):
+    """
+    Функция события для прохождения перицентра: (r, v), переходящая через ноль снизу вверх.
+    Знак (r, v) совпадает со знаком sin(nu) оскулирующей орбиты, поэтому это же момент перехода
+    истинной аномалии через 2π, то есть граница витка.
+    """
+    return np.einsum('...i,...i->...', y[..., 0:3], y[..., 3:6])
+
+
+# Название события -> (функция события g(t, y) для массива состояний, направление перехода через ноль:
+# 1 - снизу вверх, -1 - сверху вниз, 0 - любое)
+ORBIT_EVENTS = {
+    "ascending_node": (ascending_node, 1),
+    "periapsis": (periapsis, 1),
+}
+
+
+class EventDetector:
+    """
+    Приёмник траектории (sink для propagate или stream), который находит моменты событий - переходы функций
+    событий через ноль - и запоминает точные время и состояние в эти моменты.
+    Функции событий считаются сразу для всего куска; между узлами, где сменился знак, корень уточняется
+    методом ложного положения (Иллинойс) по плотной выдаче (интерполяции Эрмита).
+    Хранятся только события, поэтому таблицам по виткам нужно O(витков) данных, а не O(шагов).
+    Если траектория начинается в самой точке события (например, старт из перицентра при nu = 0), то есть
+    значение функции события в начальной точке пренебрежимо мало, начальная точка тоже считается событием.
+    """
+
+    def __init__(self, f, events: dict = None, second_order: bool = True, tolerance: float = 1e-6):
+        """
+            :param f: Функция f(t, y) правых частей, которой считается траектория (нужна для интерполяции).
+            :param events: Словарь название -> (g(t, y), направление); по умолчанию ORBIT_EVENTS.
+            :param second_order: Вектор состояния имеет вид (r, v), а правые части - (v, a).
+            :param tolerance: Точность времени события (секунды).
+        """
+        self.f = f
+        self.events = ORBIT_EVENTS if events is None else events
+        self.second_order = second_order
+        self.tolerance = tolerance
+        self.times = {name: [] for name in self.events}  # Моменты событий
+        self.states = {name: [] for name in self.events}  # Векторы состояния в моменты событий
+        self.t_start = None  # Начальная точка траектории
+        self.last_t = self.last_y = None  # Последняя точка предыдущего куска
+
+    def __call__(self, t: np.ndarray, y: np.ndarray):
+        first_chunk = self.t_start is None
+        if first_chunk:
+            self.t_start = t[0]
+        if self.last_t is not None:
+            # Интервал между кусками тоже проверяем
+            t = np.concatenate(([self.last_t], t))
+            y = np.concatenate((self.last_y[np.newaxis], y))
+        if len(t) >= 2:
+            for name, (g, direction) in self.events.items():
+                values = g(t, y)
+                if first_chunk and abs(values[0]) <= 1e-12 * np.max(np.abs(values)):
+                    self.times[name].append(t[0])
+                    self.states[name].append(np.array(y[0]))
+                previous, current = values[:-1], values[1:]
+                rising = (previous < 0) & (current >= 0)
+                falling = (previous > 0) & (current <= 0)
+                crossing = rising if direction > 0 else falling if direction < 0 else rising | falling
+                for k in np.where(crossing)[0]:
+                    t_event, y_event = self.locate(g, t[k:k + 2], y[k:k + 2], previous[k], current[k])
+                    if t_event - self.t_start <= self.tolerance:
+                        continue  # Событие в начальной точке уже учтено выше
+                    self.times[name].append(t_event)
+                    self.states[name].append(y_event)
+        self.last_t, self.last_y = t[-1], np.array(y[-1])
+
+    def locate(self, g, t: np.ndarray, y: np.ndarray, g_a: float, g_b: float) -> tuple:
+        """
+        Уточняет момент перехода g через ноль на интервале [t[0], t[1]].
+
+        :return: Время события и вектор состояния в этот момент.
+        """
+        segment = Trajectory(t, y, self.f, second_order=self.second_order)
+        a, b = t[0], t[1]
+        if g_b == 0:
+            return b, np.array(y[1])
+
+        side = 0
+        for _ in range(100):
+            if b - a <= self.tolerance:
+                break
+            c = b - g_b * (b - a) / (g_b - g_a)
+            if not a < c < b:
+                c = (a + b) / 2
+            g_c = g(c, segment.at(c))
+            if g_c == 0:
+                a = b = c
+                break
+            if np.sign(g_c) == np.sign(g_b):
+                b, g_b = c, g_c
+                if side == 1:
+                    g_a /= 2  # Модификация Иллинойс: не даём одному концу застрять
+                side = 1
+            else:
+                a, g_a = c, g_c
+                if side == -1:
+                    g_b /= 2
+                side = -1
+
+        t_event = (a + b) / 2
+        return t_event, segment.at(t_event)
+
+    def get(self, name: str) -> tuple:
+        """
+        Моменты и состояния события name.
+
+        :return: NumPy массив моментов и NumPy массив векторов состояния.
+        """
+        return np.array(self.times[name]), np.array(self.states[name]).reshape((-1,) + np.shape(self.last_y))
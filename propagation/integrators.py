@@ -0,0 +1,321 @@
+from fractions import Fraction
+
+import numpy as np
+
+
+def runge_kutta_4(f, t0: float, y0: np.ndarray, h, n: int, step_hook=None) -> tuple:
+    """
+    Метод Рунге-Кутта 4-го порядка для решения системы дифференциальных уравнений
+
+    Аргументы:
+    f: функция, описывающая систему дифференциальных уравнений
+       Принимает аргументы t и y и возвращает массив значений производных dy/dx
+    t0: начальное значение t
+    y0: начальное значение y (массив значений)
+    h: шаг интегрирования
+    n: количество шагов
+    step_hook: функция step_hook(i, t, y), вызываемая перед каждым шагом (например, для дискретного управления)
+
+    Возвращает:
+    Массив значений t и массив значений y (в каждом элементе массива - массив значений y для соответствующего t)
+    """
+
+    # Создаем массивы для хранения результатов
+    t = np.zeros(n + 1)
+    y = np.zeros((n + 1,) + np.shape(y0))
+
+    # Записываем начальные значения
+    t[0] = t0
+    y[0] = y0
+
+    # Итерационный процесс метода Рунге-Кутта 4-го порядка
+    for i in range(n):
+        if step_hook is not None:
+            step_hook(i, t[i], y[i])
+
+        k1 = f(t[i], y[i])
+        k2 = f(t[i] + h / 2, y[i] + h / 2 * k1)
+        k3 = f(t[i] + h / 2, y[i] + h / 2 * k2)
+        k4 = f(t[i] + h, y[i] + h * k3)
+
+        t[i + 1] = t[i] + h
+        y[i + 1] = y[i] + (k1 + 2 * k2 + 2 * k3 + k4) * h / 6
+
+    return t, y
+
+
+# Коэффициенты вложенного метода Дормана-Принса 5(4)
+DOPRI_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+DOPRI_A = [
+    np.array([]),
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+    np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+]
+DOPRI_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DOPRI_E = DOPRI_B - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+def dormand_prince_45(f, t0: float, y0: np.ndarray, h, n: int, step_hook=None,
+                      rtol: float = 1e-11, atol: float = 1e-9) -> tuple:
+    """
+    Вложенный метод Дормана-Принса 5(4) с автоматическим выбором шага.
+    Интегрирует на том же отрезке, что и runge_kutta_4 с теми же h и n: от t0 до t0 + n * h
+
+    Аргументы:
+    f: функция, описывающая систему дифференциальных уравнений
+       Принимает аргументы t и y и возвращает массив значений производных dy/dx
+    t0: начальное значение t
+    y0: начальное значение y (массив значений)
+    h: начальный шаг интегрирования
+    n: количество шагов длины h, задающее конец отрезка интегрирования
+    step_hook: функция step_hook(i, t, y), вызываемая перед каждым принятым шагом
+    rtol: относительная допустимая ошибка на шаге
+    atol: абсолютная допустимая ошибка на шаге
+
+    Возвращает:
+    Массив значений t (с неравномерным шагом) и массив значений y
+    """
+    t_end = t0 + n * h
+
+    # Результаты копим в списках, так как количество шагов заранее неизвестно
+    t_list = [t0]
+    y_list = [np.array(y0, dtype=np.float64)]
+
+    t_i, y_i = t0, y_list[0]
+    k = np.zeros((7,) + np.shape(y0))
+    k[0] = f(t_i, y_i)
+    hook_called = False
+
+    while t_i < t_end:
+        if step_hook is not None and not hook_called:
+            step_hook(len(t_list) - 1, t_i, y_i)
+            hook_called = True
+
+        last_step = h >= t_end - t_i
+        if last_step:
+            h = t_end - t_i
+
+        # Стадии метода (последняя стадия совпадает с первой стадией следующего шага)
+        for s in range(1, 7):
+            k[s] = f(t_i + DOPRI_C[s] * h, y_i + h * np.tensordot(DOPRI_A[s], k[:s], axes=1))
+
+        y_new = y_i + h * np.tensordot(DOPRI_B, k, axes=1)
+        error = h * np.tensordot(DOPRI_E, k, axes=1)
+
+        # Нормированная ошибка шага
+        scale = atol + rtol * np.maximum(np.abs(y_i), np.abs(y_new))
+        error_norm = np.sqrt(np.mean((error / scale) ** 2))
+
+        if error_norm <= 1:
+            # Шаг принят
+            t_i = t_end if last_step else t_i + h
+            y_i = y_new
+            t_list.append(t_i)
+            y_list.append(y_i)
+            k[0] = k[6]
+            hook_called = False
+
+        # Новый шаг: не меньше чем в 5 раз и не больше чем в 5 раз отличается от текущего
+        h *= min(5.0, max(0.2, 0.9 * error_norm ** -0.2)) if error_norm > 0 else 5.0
+
+    return np.array(t_list), np.array(y_list)
+
+
+def velocity_verlet(f, t0: float, y0: np.ndarray, h, n: int, step_hook=None) -> tuple:
+    """
+    Симплектический метод Верле (в скоростной форме) 2-го порядка для уравнений движения вида r'' = a(t, r).
+    Ускорение берётся из второй половины правых частей f, поэтому оно не должно зависеть от скорости
+
+    Аргументы:
+    f: функция, описывающая систему дифференциальных уравнений, y = (r, v), dy/dt = (v, a)
+    t0: начальное значение t
+    y0: начальное значение y (массив значений)
+    h: шаг интегрирования
+    n: количество шагов
+    step_hook: функция step_hook(i, t, y), вызываемая перед каждым шагом
+
+    Возвращает:
+    Массив значений t и массив значений y
+    """
+    return _symplectic_composition(f, t0, y0, h, n, step_hook, weights=(1.0,))
+
+
+def yoshida_4(f, t0: float, y0: np.ndarray, h, n: int, step_hook=None) -> tuple:
+    """
+    Симплектический метод Йошиды 4-го порядка: композиция трёх шагов метода Верле.
+    Ускорение берётся из второй половины правых частей f, поэтому оно не должно зависеть от скорости
+
+    Аргументы:
+    f: функция, описывающая систему дифференциальных уравнений, y = (r, v), dy/dt = (v, a)
+    t0: начальное значение t
+    y0: начальное значение y (массив значений)
+    h: шаг интегрирования
+    n: количество шагов
+    step_hook: функция step_hook(i, t, y), вызываемая перед каждым шагом
+
+    Возвращает:
+    Массив значений t и массив значений y
+    """
+    w1 = 1 / (2 - 2 ** (1 / 3))
+    w0 = -2 ** (1 / 3) / (2 - 2 ** (1 / 3))
+    return _symplectic_composition(f, t0, y0, h, n, step_hook, weights=(w1, w0, w1))
+
+
+def _symplectic_composition(f, t0: float, y0: np.ndarray, h, n: int, step_hook, weights: tuple) -> tuple:
+    # Композиция шагов "толчок-сдвиг-толчок" с долями шага weights
+    d = np.shape(y0)[-1] // 2
+
+    t = np.zeros(n + 1)
+    y = np.zeros((n + 1,) + np.shape(y0))
+    t[0] = t0
+    y[0] = y0
+
+    r = y[0, ..., :d].copy()
+    v = y[0, ..., d:].copy()
+    a = f(t0, y[0])[..., d:]
+
+    for i in range(n):
+        if step_hook is not None:
+            step_hook(i, t[i], y[i])
+
+        t_sub = t[i]
+        for w in weights:
+            v += w * h / 2 * a
+            r += w * h * v
+            t_sub += w * h
+            a = f(t_sub, np.concatenate((r, v), axis=-1))[..., d:]
+            v += w * h / 2 * a
+
+        t[i + 1] = t[i] + h
+        y[i + 1, ..., :d] = r
+        y[i + 1, ..., d:] = v
+
+    return t, y
+
+
+def _multistep_coefficients(order: int) -> dict:
+    # Коэффициенты методов Штёрмера-Коуэлла (для r) и Адамса (для v) в форме ординат.
+    # Находятся точно (в рациональных числах) из точности формул на многочленах при шаге 1 и t_n = 0;
+    # индекс j - узел t_n-j
+    def solve(nodes, powers, row, rhs):
+        matrix = [[Fraction(row(p, j)) for j in nodes] + [Fraction(rhs(p))] for p in powers]
+        size = len(matrix)
+        # Метод Гаусса с выбором ненулевого ведущего элемента
+        for col in range(size):
+            pivot = next(k for k in range(col, size) if matrix[k][col] != 0)
+            matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+            for k in range(size):
+                if k != col and matrix[k][col] != 0:
+                    factor = matrix[k][col] / matrix[col][col]
+                    matrix[k] = [a - factor * b for a, b in zip(matrix[k], matrix[col])]
+        return np.array([float(matrix[k][size] / matrix[k][k]) for k in range(size)])
+
+    def power(base, p):
+        return 1 if p == 0 else base ** p
+
+    predictor_nodes = range(0, order)  # a_n, ..., a_n-order+1
+    corrector_nodes = range(-1, order - 1)  # a_n+1, ..., a_n-order+2
+    second_order_powers = range(2, order + 2)
+    first_order_powers = range(1, order + 1)
+
+    def second_order_row(p, j):
+        return p * (p - 1) * power(-j, p - 2)
+
+    def second_order_rhs(p):
+        return 1 + (-1) ** p
+
+    def first_order_row(p, j):
+        return p * power(-j, p - 1)
+
+    return {
+        "stormer": solve(predictor_nodes, second_order_powers, second_order_row, second_order_rhs),
+        "cowell": solve(corrector_nodes, second_order_powers, second_order_row, second_order_rhs),
+        "adams_bashforth": solve(predictor_nodes, first_order_powers, first_order_row, lambda p: 1),
+        "adams_moulton": solve(corrector_nodes, first_order_powers, first_order_row, lambda p: 1),
+    }
+
+
+def stormer_cowell(f, t0: float, y0: np.ndarray, h, n: int, step_hook=None, order: int = 8) -> tuple:
+    """
+    Многошаговый метод "прогноз-коррекция" для уравнений движения вида r'' = a(t, r):
+    положение - формулами Штёрмера (прогноз) и Коуэлла (коррекция), скорость - формулами Адамса.
+    Первые order - 1 шагов делаются методом Рунге-Кутта 4-го порядка с дроблением шага
+
+    Аргументы:
+    f: функция, описывающая систему дифференциальных уравнений, y = (r, v), dy/dt = (v, a)
+    t0: начальное значение t
+    y0: начальное значение y (массив значений)
+    h: шаг интегрирования
+    n: количество шагов
+    step_hook: функция step_hook(i, t, y), вызываемая перед каждым шагом
+    order: порядок метода (количество используемых предыдущих ускорений)
+
+    Возвращает:
+    Массив значений t и массив значений y
+    """
+    coefficients = _multistep_coefficients(order)
+    stormer, cowell = coefficients["stormer"], coefficients["cowell"]
+    adams_bashforth, adams_moulton = coefficients["adams_bashforth"], coefficients["adams_moulton"]
+    d = np.shape(y0)[-1] // 2
+
+    t = np.zeros(n + 1)
+    y = np.zeros((n + 1,) + np.shape(y0))
+    acceleration = np.zeros((n + 1,) + np.shape(y0)[:-1] + (d,))
+    t[0] = t0
+    y[0] = y0
+    acceleration[0] = f(t0, y[0])[..., d:]
+
+    # Разгон: шаги Рунге-Кутта 4-го порядка, каждый раздроблен на 16 частей
+    substeps = 16
+    h_sub = h / substeps
+    for i in range(min(order - 1, n)):
+        if step_hook is not None:
+            step_hook(i, t[i], y[i])
+
+        y_sub = y[i].copy()
+        for s in range(substeps):
+            t_sub = t[i] + s * h_sub
+            k1 = f(t_sub, y_sub)
+            k2 = f(t_sub + h_sub / 2, y_sub + h_sub / 2 * k1)
+            k3 = f(t_sub + h_sub / 2, y_sub + h_sub / 2 * k2)
+            k4 = f(t_sub + h_sub, y_sub + h_sub * k3)
+            y_sub = y_sub + (k1 + 2 * k2 + 2 * k3 + k4) * h_sub / 6
+        t[i + 1] = t[i] + h
+        y[i + 1] = y_sub
+        acceleration[i + 1] = f(t[i + 1], y[i + 1])[..., d:]
+
+    for i in range(order - 1, n):
+        if step_hook is not None:
+            step_hook(i, t[i], y[i])
+
+        # Ускорения a_i, a_i-1, ..., a_i-order+1
+        history = acceleration[i - order + 1:i + 1][::-1]
+        t[i + 1] = t[i] + h
+
+        # Прогноз
+        r_predicted = 2 * y[i, ..., :d] - y[i - 1, ..., :d] + h ** 2 * np.tensordot(stormer, history, axes=1)
+        v_predicted = y[i, ..., d:] + h * np.tensordot(adams_bashforth, history, axes=1)
+        a_predicted = f(t[i + 1], np.concatenate((r_predicted, v_predicted), axis=-1))[..., d:]
+
+        # Коррекция: в формулах Коуэлла и Адамса-Моултона узел a_i+1 идёт первым
+        history_corrector = np.concatenate((a_predicted[np.newaxis], history[:-1]))
+        y[i + 1, ..., :d] = 2 * y[i, ..., :d] - y[i - 1, ..., :d] + \
+            h ** 2 * np.tensordot(cowell, history_corrector, axes=1)
+        y[i + 1, ..., d:] = y[i, ..., d:] + h * np.tensordot(adams_moulton, history_corrector, axes=1)
+        acceleration[i + 1] = f(t[i + 1], y[i + 1])[..., d:]
+
+    return t, y
+
+
+# Методы интегрирования с общей сигнатурой (f, t0, y0, h, n, step_hook)
+INTEGRATORS = {
+    "rk4": runge_kutta_4,
+    "dopri45": dormand_prince_45,
+    "verlet": velocity_verlet,
+    "yoshida4": yoshida_4,
+    "stormer_cowell": stormer_cowell,
+}
@@ -0,0 +1,335 @@
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Без numba ядра остаются обычными функциями Python на скалярах (без временных массивов NumPy)
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+@njit(cache=True)
+def pendulum(t, y, params, out):
+    """
+    Правые части уравнений математического маятника.
+
+        :param t: Время (секунды).
+        :param y: Вектор состояния (угол, угловая скорость).
+        :param params: NumPy массив параметров (g, l).
+        :param out: NumPy массив из 2 элементов, в который записывается результат.
+
+    :return: out
+    """
+    out[0] = y[1]
+    out[1] = -params[0] / params[1] * math.sin(y[0])
+    return out
+
+
+@njit(cache=True)
+def pendulum_batch(t, y, params, out):
+    """
+    Правые части уравнений математического маятника сразу для N начальных условий.
+
+        :param t: Время (секунды).
+        :param y: Плоский NumPy массив из 2N элементов (угол и угловая скорость для каждого маятника подряд).
+        :param params: NumPy массив параметров (g, l).
+        :param out: NumPy массив из 2N элементов, в который записывается результат.
+
+    :return: out
+    """
+    # Без срезов: для двух уравнений накладные расходы на срез больше самого расчёта
+    g_l = params[0] / params[1]
+    for k in range(y.shape[0] // 2):
+        out[2 * k] = y[2 * k + 1]
+        out[2 * k + 1] = -g_l * math.sin(y[2 * k])
+    return out
+
+
+@njit(cache=True)
+def two_body(t, y, params, out):
+    """
+    Правые части задачи двух тел.
+
+        :param t: Время (секунды).
+        :param y: Вектор состояния (x, y, z, vx, vy, vz).
+        :param params: NumPy массив параметров (mu,).
+        :param out: NumPy массив из 6 элементов, в который записывается результат.
+
+    :return: out
+    """
+    mu = params[0]
+    x, y_, z = y[0], y[1], y[2]
+    r = math.sqrt(x * x + y_ * y_ + z * z)
+    k = -mu / (r * r * r)
+
+    out[0] = y[3]
+    out[1] = y[4]
+    out[2] = y[5]
+    out[3] = k * x
+    out[4] = k * y_
+    out[5] = k * z
+    return out
+
+
+@njit(cache=True)
+def j2(t, y, params, out):
+    """
+    Правые части задачи двух тел с учётом второй зональной гармоники J2.
+
+        :param t: Время (секунды).
+        :param y: Вектор состояния (x, y, z, vx, vy, vz).
+        :param params: NumPy массив параметров (mu, J2, R).
+        :param out: NumPy массив из 6 элементов, в который записывается результат.
+
+    :return: out
+    """
+    mu, J2, R = params[0], params[1], params[2]
+    x, y_, z = y[0], y[1], y[2]
+    rho2 = x * x + y_ * y_
+    r2 = rho2 + z * z
+    r = math.sqrt(r2)
+    k = -mu / (r2 * r)
+    k_j2 = 1.5 * J2 * mu * R * R / (r2 * r2 * r2 * r)
+
+    out[0] = y[3]
+    out[1] = y[4]
+    out[2] = y[5]
+    out[3] = k * x - k_j2 * x * (rho2 - 4 * z * z)
+    out[4] = k * y_ - k_j2 * y_ * (rho2 - 4 * z * z)
+    out[5] = k * z + k_j2 * (-3 * z * rho2 + 2 * z * z * z)
+    return out
+
+
+@njit(cache=True)
+def two_body_batch(t, y, params, out):
+    """
+    Правые части задачи двух тел сразу для N спутников.
+
+        :param t: Время (секунды).
+        :param y: Плоский NumPy массив из 6N элементов (векторы состояния спутников подряд).
+        :param params: NumPy массив параметров (mu,).
+        :param out: NumPy массив из 6N элементов, в который записывается результат.
+
+    :return: out
+    """
+    for k in range(y.shape[0] // 6):
+        two_body(t, y[6 * k:6 * k + 6], params, out[6 * k:6 * k + 6])
+    return out
+
+
+@njit(cache=True)
+def j2_batch(t, y, params, out):
+    """
+    Правые части задачи двух тел с учётом J2 сразу для N спутников.
+
+        :param t: Время (секунды).
+        :param y: Плоский NumPy массив из 6N элементов (векторы состояния спутников подряд).
+        :param params: NumPy массив параметров (mu, J2, R).
+        :param out: NumPy массив из 6N элементов, в который записывается результат.
+
+    :return: out
+    """
+    for k in range(y.shape[0] // 6):
+        j2(t, y[6 * k:6 * k + 6], params, out[6 * k:6 * k + 6])
+    return out
+
+
+@njit(cache=True)
+def runge_kutta_4_loop(kernel, t0, y0, h, n, params, every=1):
+    """
+    Метод Рунге-Кутта 4-го порядка, целиком выполняемый в скомпилированном коде.
+    Сохраняется только каждая every-я точка (и всегда последняя), промежуточные состояния не хранятся.
+
+        :param kernel: Ядро правых частей kernel(t, y, params, out) из этого модуля.
+        :param t0: Начальное значение t.
+        :param y0: Начальное значение y (массив значений).
+        :param h: Шаг интегрирования.
+        :param n: Количество шагов.
+        :param params: NumPy массив параметров ядра.
+        :param every: Шаг выдачи результатов в шагах интегрирования.
+
+    :return: Массив значений t и массив значений y в точках выдачи.
+    """
+    d = y0.shape[0]
+    m = n // every + 1
+    if n % every != 0:
+        m += 1
+    t = np.empty(m)
+    y = np.empty((m, d))
+    k1 = np.empty(d)
+    k2 = np.empty(d)
+    k3 = np.empty(d)
+    k4 = np.empty(d)
+    y_tmp = np.empty(d)
+    y_cur = y0.copy()
+    y_next = np.empty(d)
+
+    t_cur = t0
+    t[0] = t0
+    y[0] = y0
+    k = 1
+
+    for i in range(n):
+        kernel(t_cur, y_cur, params, k1)
+        for j in range(d):
+            y_tmp[j] = y_cur[j] + h / 2 * k1[j]
+        kernel(t_cur + h / 2, y_tmp, params, k2)
+        for j in range(d):
+            y_tmp[j] = y_cur[j] + h / 2 * k2[j]
+        kernel(t_cur + h / 2, y_tmp, params, k3)
+        for j in range(d):
+            y_tmp[j] = y_cur[j] + h * k3[j]
+        kernel(t_cur + h, y_tmp, params, k4)
+
+        for j in range(d):
+            y_next[j] = y_cur[j] + (k1[j] + 2 * k2[j] + 2 * k3[j] + k4[j]) * h / 6
+        t_cur = t_cur + h
+        y_cur, y_next = y_next, y_cur
+
+        if (i + 1) % every == 0 or i + 1 == n:
+            t[k] = t_cur
+            y[k] = y_cur
+            k += 1
+
+    return t, y
+
+
+@njit(cache=True)
+def pendulum_closed_loop(t0, y0, h, n, params, control, period_U, noise):
+    """
+    Маятник с дискретным ПД-управлением и методом Рунге-Кутта 4-го порядка в одном скомпилированном цикле.
+    Раз в period_U шагов управление пересчитывается по измеренным (с шумом из noise) углу и угловой скорости
+    и держится постоянным до следующего пересчёта - то же, что propagate с Control.sampling_hook.
+
+        :param t0: Начальное значение t.
+        :param y0: Начальные угол и угловая скорость.
+        :param h: Шаг интегрирования.
+        :param n: Количество шагов.
+        :param params: NumPy массив параметров маятника (g, l).
+        :param control: NumPy массив параметров управления (kf_alfa, kf_beta, требуемый угол,
+                        g / l * sin(требуемый угол) по оценкам g и l).
+        :param period_U: Количество шагов между пересчётами управления.
+        :param noise: NumPy массив (количество пересчётов, 2) с шумом измерений угла и угловой скорости.
+
+    :return: Массив значений t, массив значений y и журнал управления (количество пересчётов, 4)
+             со строками (t, U, измеренный угол, измеренная угловая скорость).
+    """
+    t = np.empty(n + 1)
+    y = np.empty((n + 1, 2))
+    telemetry = np.empty((noise.shape[0], 4))
+    k1 = np.empty(2)
+    k2 = np.empty(2)
+    k3 = np.empty(2)
+    k4 = np.empty(2)
+    y_tmp = np.empty(2)
+    p = np.empty(2)
+    p[0] = params[0]
+    p[1] = params[1]
+
+    t[0] = t0
+    y[0, 0] = y0[0]
+    y[0, 1] = y0[1]
+    U = 0.0
+    m = 0
+
+    for i in range(n):
+        if i % period_U == 0:
+            alfa = y[i, 0] + noise[m, 0]
+            alfa_dot = y[i, 1] + noise[m, 1]
+            U = control[0] * (alfa - control[2]) - control[1] * alfa_dot + control[3]
+            telemetry[m, 0] = t[i]
+            telemetry[m, 1] = U
+            telemetry[m, 2] = alfa
+            telemetry[m, 3] = alfa_dot
+            m += 1
+
+        pendulum(t[i], y[i], p, k1)
+        k1[1] += U
+        for j in range(2):
+            y_tmp[j] = y[i, j] + h / 2 * k1[j]
+        pendulum(t[i] + h / 2, y_tmp, p, k2)
+        k2[1] += U
+        for j in range(2):
+            y_tmp[j] = y[i, j] + h / 2 * k2[j]
+        pendulum(t[i] + h / 2, y_tmp, p, k3)
+        k3[1] += U
+        for j in range(2):
+            y_tmp[j] = y[i, j] + h * k3[j]
+        pendulum(t[i] + h, y_tmp, p, k4)
+        k4[1] += U
+
+        t[i + 1] = t[i] + h
+        for j in range(2):
+            y[i + 1, j] = y[i, j] + (k1[j] + 2 * k2[j] + 2 * k3[j] + k4[j]) * h / 6
+
+    return t, y, telemetry[:m]
+
+
+@njit(cache=True)
+def pendulum_closed_loop_batch(t0, y0, h, n, params, control, period_U, noise, band):
+    """
+    pendulum_closed_loop сразу для N реализаций (метод Монте-Карло): у каждой реализации свои параметры управления
+    и свой шум измерений, состояния хранятся массивом (N, 2). Траектории не сохраняются - для каждой реализации
+    считаются только конечное состояние и время установления, поэтому память не зависит от количества шагов.
+    Каждая реализация считается теми же операциями, что и в pendulum_closed_loop, и совпадает с ним бит в бит.
+
+        :param t0: Начальное значение t.
+        :param y0: NumPy массив (N, 2) начальных углов и угловых скоростей.
+        :param h: Шаг интегрирования.
+        :param n: Количество шагов.
+        :param params: NumPy массив параметров маятника (g, l).
+        :param control: NumPy массив (N, 4) параметров управления каждой реализации (как в pendulum_closed_loop).
+        :param period_U: Количество шагов между пересчётами управления.
+        :param noise: NumPy массив (количество пересчётов, N, 2) с шумом измерений угла и угловой скорости.
+        :param band: Угол считается установившимся, если отличается от требуемого меньше чем на band.
+
+    :return: NumPy массив (N, 2) конечных состояний и NumPy массив (N,) времён установления - времени
+             (от t0) последней точки, в которой угол отличался от требуемого больше чем на band.
+    """
+    count = y0.shape[0]
+    y = np.empty((count, 2))
+    U = np.zeros(count)
+    settling = np.zeros(count)
+    g = params[0]
+    l = params[1]
+    for k in range(count):
+        y[k, 0] = y0[k, 0]
+        y[k, 1] = y0[k, 1]
+
+    t = t0
+    m = 0
+    for i in range(n):
+        measure = i % period_U == 0
+        for k in range(count):
+            alfa, alfa_dot = y[k, 0], y[k, 1]
+            if measure:
+                U[k] = control[k, 0] * (alfa + noise[m, k, 0] - control[k, 2]) - \
+                    control[k, 1] * (alfa_dot + noise[m, k, 1]) + control[k, 3]
+
+            # Метод Рунге-Кутта 4-го порядка без временных массивов (правые части как в ядре pendulum)
+            k1_0 = alfa_dot
+            k1_1 = -g / l * math.sin(alfa) + U[k]
+            k2_0 = alfa_dot + h / 2 * k1_1
+            k2_1 = -g / l * math.sin(alfa + h / 2 * k1_0) + U[k]
+            k3_0 = alfa_dot + h / 2 * k2_1
+            k3_1 = -g / l * math.sin(alfa + h / 2 * k2_0) + U[k]
+            k4_0 = alfa_dot + h * k3_1
+            k4_1 = -g / l * math.sin(alfa + h * k3_0) + U[k]
+            y[k, 0] = alfa + (k1_0 + 2 * k2_0 + 2 * k3_0 + k4_0) * h / 6
+            y[k, 1] = alfa_dot + (k1_1 + 2 * k2_1 + 2 * k3_1 + k4_1) * h / 6
+        if measure:
+            m += 1
+
+        t = t + h
+        for k in range(count):
+            if abs(y[k, 0] - control[k, 2]) > band:
+                settling[k] = t - t0
+
+    return y, settling
@@ -0,0 +1,87 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from propagation.elements import xyz_to_elements
+
+
+class TrajectoryWriter:
+    """
+    Приёмник траектории (sink для propagate или stream), который пишет t, вектор состояния и элементы орбиты
+    в отображаемые в память файлы .npy в папке path, а параметры расчёта - в meta.json.
+    Файлы создаются сразу на n_points точек; сколько точек записано на самом деле, хранится в meta.json.
+    """
+
+    def __init__(self, path: str, n_points: int, state_shape: tuple = (6,), mu: float = None, length: int = None,
+                 **metadata):
+        """
+            :param path: Папка для файлов траектории (создаётся, если её нет).
+            :param n_points: Количество точек траектории (n + 1 для метода с постоянным шагом).
+            :param state_shape: Форма вектора состояния в одной точке ((6,) для орбиты, (N, 6) для N спутников).
+            :param mu: Гравитационный параметр. Если задан, вместе с состоянием пишутся элементы орбиты.
+            :param length: Если задано, файлы уже созданы раньше и открываются для дозаписи после первых length
+                           точек (продолжение расчёта с контрольной точки).
+            :param metadata: Параметры расчёта для meta.json (начальные элементы, start_datetime, h и т.д.).
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.mu = mu
+        self.metadata = {key: value.isoformat() if isinstance(value, datetime) else value
+                         for key, value in metadata.items()}
+        self.length = length or 0  # Количество записанных точек
+
+        mode = "w+" if length is None else "r+"
+        shape = (n_points,) + tuple(state_shape)
+        self.t = np.lib.format.open_memmap(os.path.join(path, "t.npy"), mode=mode, shape=(n_points,))
+        self.y = np.lib.format.open_memmap(os.path.join(path, "y.npy"), mode=mode, shape=shape)
+        self.elements = None
+        if mu is not None:
+            self.elements = np.lib.format.open_memmap(os.path.join(path, "elements.npy"), mode=mode, shape=shape)
+
+    def __call__(self, t: np.ndarray, y: np.ndarray):
+        end = self.length + len(t)
+        if end > len(self.t):
+            raise ValueError(f"Траектория не помещается в {len(self.t)} точек")
+
+        self.t[self.length:end] = t
+        self.y[self.length:end] = y
+        if self.elements is not None:
+            self.elements[self.length:end] = xyz_to_elements(y, self.mu).reshape(np.shape(y))
+        self.length = end
+
+    def flush(self):
+        for array in (self.t, self.y, self.elements):
+            if array is not None:
+                array.flush()
+
+    def close(self):
+        self.flush()
+
+        metadata = dict(self.metadata, mu=self.mu, length=self.length)
+        with open(os.path.join(self.path, "meta.json"), "w") as file:
+            json.dump(metadata, file, ensure_ascii=False, indent=4)
+
+
+class StoredTrajectory:
+    """
+    Траектория, записанная TrajectoryWriter. Массивы открываются без копирования (только для чтения),
+    с диска читаются только те срезы, к которым обращаются.
+    """
+
+    def __init__(self, path: str):
+        """
+            :param path: Папка с файлами траектории.
+        """
+        with open(os.path.join(path, "meta.json")) as file:
+            self.metadata = json.load(file)
+        if "start_datetime" in self.metadata:
+            self.metadata["start_datetime"] = datetime.fromisoformat(self.metadata["start_datetime"])
+
+        length = self.metadata["length"]
+        self.t = np.load(os.path.join(path, "t.npy"), mmap_mode="r")[:length]
+        self.y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")[:length]
+        self.elements = None
+        if os.path.exists(os.path.join(path, "elements.npy")):
+            self.elements = np.load(os.path.join(path, "elements.npy"), mmap_mode="r")[:length]
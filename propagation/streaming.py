@@ -0,0 +1,109 @@
+import numpy as np
+
+from propagation.core import kernel_function, output_cadence, propagate, select_output
+
+
+def propagate_chunks(f, t0: float, y0: np.ndarray, h, n: int, chunk_size: int = 100000, method: str = "rk4",
+                     step_hook=None, kernel=None, params: np.ndarray = None, every: int = 1, dt_out: float = None,
+                     **options):
+    """
+    Потоковый вариант propagate: интегрирует по кускам из chunk_size шагов и отдаёт их по одному,
+    поэтому в памяти одновременно находится только один кусок траектории, а не весь массив (n + 1, d).
+
+    Каждый кусок интегрируется тем же propagate от последней точки предыдущего куска, так что для
+    одношаговых методов с постоянным шагом ("rk4", "verlet", "yoshida4") траектория совпадает с
+    траекторией propagate. "dopri45" начинает каждый кусок с начального шага h, "stormer_cowell" -
+    заново с разгона, поэтому кусок лучше брать большим.
+
+    Шаг выдачи (every или dt_out) отсчитывается от начала траектории, а не куска, поэтому точки выдачи
+    не зависят от chunk_size.
+
+        :param f: Функция f(t, y) правых частей (может быть None, если задано ядро).
+        :param t0: Начальное значение t.
+        :param y0: Начальное значение y (массив значений).
+        :param h: Шаг интегрирования (для "dopri45" - начальный шаг).
+        :param n: Количество шагов.
+        :param chunk_size: Количество шагов длины h в одном куске.
+        :param method: Название метода интегрирования из INTEGRATORS.
+        :param step_hook: Функция step_hook(i, t, y), вызываемая перед каждым шагом (i - сквозной номер шага).
+        :param kernel: Ядро правых частей kernel(t, y, params, out) из модуля kernels.
+        :param params: NumPy массив параметров ядра.
+        :param every: Выдавать каждую every-ю точку сетки интегрирования.
+        :param dt_out: Выдавать точки через dt_out секунд (вместо every).
+        :param options: Дополнительные параметры метода (например, rtol и atol для "dopri45").
+
+    :return: Генератор пар (t, y): массив значений t и массив значений y точек выдачи куска.
+             Первый кусок начинается с начальной точки, следующие - с точки после конца предыдущего.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size должен быть положительным")
+
+    y_i = np.asarray(y0, dtype=np.float64)
+    if n == 0:
+        yield np.array([t0]), y_i[np.newaxis].copy()
+
+    for t, y, _, _ in propagate_from(f, t0, y_i, h, n, chunk_size, 0, 0, method=method, step_hook=step_hook,
+                                     kernel=kernel, params=params, every=every, dt_out=dt_out, origin=t0, **options):
+        yield t, y
+
+
+def propagate_from(f, t_i: float, y_i: np.ndarray, h, n: int, chunk_size: int, done: int, offset: int,
+                   method: str = "rk4", step_hook=None, kernel=None, params: np.ndarray = None, every: int = 1,
+                   dt_out: float = None, origin: float = None, **options):
+    """
+    Продолжает интегрирование кусками с точки (t_i, y_i), после которой пройдено done шагов длины h из n
+    и offset шагов метода (сквозной номер для step_hook). Используется в propagate_chunks и при продолжении
+    расчёта с контрольной точки. Точки выдачи отбираются по сквозному номеру шага (every) или по сетке
+    origin + j * dt_out (origin - начало всей траектории).
+
+    :return: Генератор четвёрок (t, y, done, offset) - кусок и состояние счётчиков после него.
+             Начальная точка входит в кусок только при done = 0.
+    """
+    every, dt_out = output_cadence(method, h, every, dt_out)
+    if dt_out is not None and f is None:
+        f = kernel_function(kernel, np.asarray(params, dtype=np.float64))
+
+    while done < n:
+        steps = min(chunk_size, n - done)
+        hook = None
+        if step_hook is not None:
+            def hook(i, t, y, offset=offset):
+                step_hook(i + offset, t, y)
+
+        t, y = propagate(f, t_i, y_i, h, steps, method=method, step_hook=hook, kernel=kernel, params=params,
+                         **options)
+        t_i, y_i = t[-1], y[-1].copy()
+        start, first = offset, done == 0
+        offset += len(t) - 1
+        done += steps
+        if every == 1 and dt_out is None:
+            t, y = t[0 if first else 1:], y[0 if first else 1:]
+        else:
+            t, y = select_output(t, y, f, every=every, dt_out=dt_out, start=start, origin=origin, first=first,
+                                 last=done == n)
+        yield t, y, done, offset
+
+
+def stream(chunks, *sinks) -> tuple:
+    """
+    Передаёт куски траектории приёмникам. Приёмник - функция sink(t, y), вызываемая для каждого куска
+    (например, EventDetector или TrajectoryWriter). Если у приёмника есть метод close(),
+    он вызывается после последнего куска.
+
+        :param chunks: Итератор пар (t, y), например propagate_chunks(...).
+        :param sinks: Приёмники кусков.
+
+    :return: Последнее значение t и последнее значение y.
+    """
+    t_last = y_last = None
+    for t, y in chunks:
+        for sink in sinks:
+            sink(t, y)
+        if len(t):
+            t_last, y_last = t[-1], y[-1]
+
+    for sink in sinks:
+        close = getattr(sink, "close", None)
+        if close is not None:
+            close()
+    return t_last, y_last
@@ -0,0 +1,83 @@
+import itertools
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+def grid(**axes) -> list:
+    """
+    Строит список сценариев как декартово произведение значений параметров.
+
+    Пример: grid(a=[7e6, 8e6], i=[0.5, 1.2]) -> [{'a': 7e6, 'i': 0.5}, {'a': 7e6, 'i': 1.2}, ...]
+
+        :param axes: Имя параметра -> список его значений.
+
+    :return: Список словарей с параметрами сценариев.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def run_sweep(worker, configs: list, max_workers: int = None) -> list:
+    """
+    Запускает сценарии параллельно в пуле процессов и собирает одну таблицу результатов.
+
+    worker должен быть функцией верхнего уровня модуля (её передают в другие процессы через pickle),
+    принимать словарь параметров сценария и возвращать словарь итоговых метрик.
+    Скрипты, вызывающие run_sweep, должны запускать его под if __name__ == '__main__'.
+
+        :param worker: Функция worker(config) -> dict с метриками сценария.
+        :param configs: Список словарей с параметрами сценариев (например, из grid).
+        :param max_workers: Количество процессов (по умолчанию - все ядра).
+
+    :return: Список словарей: параметры сценария и его метрики, в порядке configs.
+    """
+    configs = list(configs)
+    if not configs:
+        return []
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # Отдаём сценарии пачками, чтобы короткие сценарии не упирались в накладные расходы на передачу
+    chunksize = max(1, math.ceil(len(configs) / (4 * max_workers)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        metrics = list(executor.map(worker, configs, chunksize=chunksize))
+
+    return [{**config, **result} for config, result in zip(configs, metrics)]
+
+
+def run_search(worker, configs: list, max_workers: int = None, cost: str = "cost", bound: float = math.inf) -> list:
+    """
+    Перебор сценариев в пуле процессов с отсечением. Каждый сценарий получает в config["bound"] лучшую стоимость
+    среди уже посчитанных, чтобы worker мог прекратить расчёт, как только его стоимость заведомо больше.
+    Сценарии отдаются в пул по мере освобождения процессов (не больше двух на процесс одновременно),
+    поэтому граница уточняется по ходу перебора. Требования к worker те же, что в run_sweep.
+
+        :param worker: Функция worker(config) -> dict с метриками сценария, среди которых есть стоимость cost
+                       (для прерванного сценария - нижняя оценка стоимости или inf).
+        :param configs: Список словарей с параметрами сценариев (например, из grid).
+        :param max_workers: Количество процессов (по умолчанию - все ядра).
+        :param cost: Название метрики стоимости.
+        :param bound: Начальная граница отсечения (например, лучшая стоимость предыдущего перебора).
+
+    :return: Список словарей: параметры сценария и его метрики, в порядке configs.
+    """
+    configs = list(configs)
+    max_workers = max_workers or os.cpu_count() or 1
+    results = [None] * len(configs)
+    best = bound
+    queue = iter(enumerate(configs))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(worker, dict(config, bound=best)): index
+                   for index, config in itertools.islice(queue, 2 * max_workers)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                result = future.result()
+                results[index] = {**configs[index], **result}
+                best = min(best, result[cost])
+                for next_index, config in itertools.islice(queue, 1):
+                    pending[executor.submit(worker, dict(config, bound=best))] = next_index
+
+    return results
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень репозитория с пакетом propagation
+
+from propagation.kernels import pendulum_closed_loop, pendulum_closed_loop_batch
+
+
+def test_batch_matches_single_realisations():
+    rng = np.random.default_rng(0)
+    count, h, n, period_U, band = 20, 0.01, 300, 7, 0.01
+    required_angle = np.pi / 4
+    params = np.array([9.8, 1.0])
+    y0 = np.column_stack((rng.uniform(0, np.pi / 2, count), rng.uniform(-2, 2, count)))
+    control = np.column_stack((rng.uniform(-5, -1, count), rng.uniform(1, 5, count), np.full(count, required_angle),
+                               9.8 * (1 + 0.01 * rng.standard_normal(count)) * np.sin(required_angle)))
+    noise = np.array([0.01, 0.03]) * rng.standard_normal(((n - 1) // period_U + 1, count, 2))
+
+    y_end, settling = pendulum_closed_loop_batch(0.0, y0, h, n, params, control, period_U, noise, band)
+
+    for k in range(count):
+        t, y, _ = pendulum_closed_loop(0.0, y0[k], h, n, params, control[k], period_U,
+                                       np.ascontiguousarray(noise[:, k]))
+        outside = np.nonzero(np.abs(y[:, 0] - required_angle) > band)[0]
+        assert np.array_equal(y_end[k], y[-1])
+        assert settling[k] == (t[outside[-1]] - t[0] if len(outside) else 0.0)
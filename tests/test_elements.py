@@ -0,0 +1,87 @@
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)  # корень репозитория с пакетом propagation
+
+from propagation.elements import elements_to_xyz, xyz_to_elements
+
+MU = 3.986004418 * 10 ** 14  # Гравитационный параметр
+
+
+def load_orbit_class():
+    # В каждой задаче свой модуль classes, поэтому модуль 2_B загружается по пути под своим именем
+    spec = importlib.util.spec_from_file_location("classes_2B", os.path.join(ROOT, "2_B", "classes.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Orbit
+
+
+@pytest.fixture(scope="module")
+def orbit():
+    Orbit = load_orbit_class()
+    return Orbit(a=8059 * 1000, e=0.15, i=1.2, w=1.37, omega=0.7, nu=0.0, mu=MU,
+                 start_datetime=datetime(2023, 11, 14, 19, 00), compiled_rhs=False)
+
+
+def random_elements(count: int, seed: int = 0) -> np.ndarray:
+    # Эллиптические орбиты вдали от вырожденных случаев (i = 0, e = 0)
+    rng = np.random.default_rng(seed)
+    return np.column_stack((rng.uniform(6600e3, 45000e3, count), rng.uniform(0.01, 0.9, count),
+                            rng.uniform(0.05, np.pi - 0.05, count), rng.uniform(-np.pi, np.pi, count),
+                            rng.uniform(-np.pi, np.pi, count), rng.uniform(0, 2 * np.pi, count)))
+
+
+def angle_difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # Разность углов, приведённая к [-π, π)
+    return np.mod(a - b + np.pi, 2 * np.pi) - np.pi
+
+
+def assert_elements_close(actual: np.ndarray, expected: np.ndarray, rtol: float, atol_angle: float):
+    np.testing.assert_allclose(actual[:, 0:2], expected[:, 0:2], rtol=rtol)
+    np.testing.assert_allclose(angle_difference(actual[:, 2:6], expected[:, 2:6]), 0, atol=atol_angle)
+
+
+def test_xyz_to_elements_matches_per_row(orbit):
+    # Порядок операций у xyz_to_elements другой, поэтому совпадение - с точностью до нескольких ULP, а не побитовое
+    states = np.array([orbit.from_elements_to_xyz(*row) for row in random_elements(500)])
+
+    expected = np.array([orbit.from_xyz_to_elements(state) for state in states])
+    assert_elements_close(xyz_to_elements(states, mu=MU), expected, rtol=1e-12, atol_angle=1e-12)
+    assert_elements_close(orbit.from_xyz_to_elements_batch(states), expected, rtol=1e-12, atol_angle=1e-12)
+
+
+def test_elements_to_xyz_matches_per_row(orbit):
+    elements = random_elements(500, seed=1)
+    expected = np.array([orbit.from_elements_to_xyz(*row) for row in elements])
+    np.testing.assert_allclose(elements_to_xyz(elements, mu=MU), expected, rtol=1e-12, atol=1e-12 * 45000e3)
+
+
+def test_round_trip_random_orbits():
+    elements = random_elements(1000, seed=2)
+    assert_elements_close(xyz_to_elements(elements_to_xyz(elements, mu=MU), mu=MU), elements, rtol=1e-11,
+                          atol_angle=1e-11)
+
+
+@pytest.mark.parametrize("e, i", [(1e-7, 1.2), (0.15, 1e-6), (1e-7, 1e-6)])
+def test_round_trip_near_degenerate_orbits(e, i):
+    # При e ≈ 0 плохо определены w и nu по отдельности (определена их сумма - аргумент широты),
+    # при i ≈ 0 - w и omega (определена долгота перицентра w + omega). Наклонение считается через arccos,
+    # поэтому при i ≈ 0 его ошибка порядка ε / i, а не ε (около 1e-10 рад, миллиметры положения)
+    elements = random_elements(200, seed=3)
+    elements[:, 1] = e
+    elements[:, 2] = i
+    states = elements_to_xyz(elements, mu=MU)
+    result = xyz_to_elements(states, mu=MU)
+
+    np.testing.assert_allclose(elements_to_xyz(result, mu=MU), states, rtol=0, atol=1e-9 * np.max(elements[:, 0]))
+    np.testing.assert_allclose(result[:, 0], elements[:, 0], rtol=1e-12)
+    np.testing.assert_allclose(result[:, 1], e, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(result[:, 2], i, rtol=0, atol=1e-15 / i)
+    np.testing.assert_allclose(angle_difference(result[:, 3] + result[:, 4] + result[:, 5],
+                                                elements[:, 3] + elements[:, 4] + elements[:, 5]), 0, atol=1e-12)